@@ -8,6 +8,23 @@ import chardet
 from typing import Optional, Tuple, Any
 import io
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Encodings pyarrow's CSV reader parses without transcoding
+ARROW_ENCODINGS = frozenset({'utf-8', 'utf-8-sig', 'ascii'})
+
+# pandas' default missing-value markers, so both readers agree on nulls
+NA_VALUES = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan',
+    '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a',
+    'nan', 'null'
+]
+
 
 def detect_csv_properties(file_content: bytes) -> Tuple[str, str]:
     """Detect encoding and delimiter for CSV file
@@ -54,6 +71,56 @@ def detect_csv_properties(file_content: bytes) -> Tuple[str, str]:
     return 'utf-8', ','
 
 
+def read_csv_arrow(file_content: bytes, delimiter: str) -> Optional[pd.DataFrame]:
+    """Read well-formed UTF-8 CSV content with pyarrow's multithreaded parser
+    
+    Columns come back typed the way pd.read_csv would type them: dates,
+    times and timestamps stay as their original text.
+    
+    Args:
+        file_content: Raw bytes content of the CSV file
+        delimiter: Field delimiter
+        
+    Returns:
+        DataFrame if pyarrow could read the content, None otherwise
+    """
+    def read(column_types=None):
+        return pacsv.read_csv(
+            io.BytesIO(file_content),
+            read_options=pacsv.ReadOptions(block_size=4 << 20),
+            parse_options=pacsv.ParseOptions(delimiter=delimiter),
+            convert_options=pacsv.ConvertOptions(
+                column_types=column_types,
+                null_values=NA_VALUES,
+                strings_can_be_null=True
+            )
+        )
+    
+    try:
+        table = read()
+        
+        # Blank or repeated headers are renamed by pandas; leave those files to it
+        names = table.column_names
+        if not all(names) or len(set(names)) != len(names):
+            return None
+        
+        # pandas does not parse dates, so read temporal columns again as text
+        temporal = {field.name: pa.string() for field in table.schema if pa.types.is_temporal(field.type)}
+        if temporal:
+            table = read(temporal)
+        
+        df = table.to_pandas()
+        
+        # Columns with no values at all are float NaN in pandas
+        for field in table.schema:
+            if pa.types.is_null(field.type):
+                df[field.name] = df[field.name].astype('float64')
+        
+        return df
+    except (pa.ArrowException, ValueError):
+        return None
+
+
 def robust_read_csv(uploaded_file: Any, **kwargs) -> Optional[pd.DataFrame]:
     """Robustly read CSV file with automatic encoding and delimiter detection
     
@@ -81,6 +148,14 @@ def robust_read_csv(uploaded_file: Any, **kwargs) -> Optional[pd.DataFrame]:
     # Detect properties
     encoding, delimiter = detect_csv_properties(file_content)
     
+    # Plain UTF-8 files go through pyarrow first; anything it rejects, or any
+    # call with extra read_csv options, takes the pandas attempts below
+    if PYARROW_AVAILABLE and not kwargs and encoding and encoding.lower() in ARROW_ENCODINGS:
+        df = read_csv_arrow(file_content, delimiter)
+        if df is not None and not df.empty and len(df.columns) > 0:
+            print(f"Successfully read CSV with pyarrow, sep='{delimiter}'")
+            return df
+    
     # List of parameter combinations to try
     read_attempts = [
         # Try with detected encoding and delimiter
@@ -103,18 +178,15 @@ def robust_read_csv(uploaded_file: Any, **kwargs) -> Optional[pd.DataFrame]:
         {'encoding': encoding, 'sep': '\t'},
     ]
     
-    # Try reading with different parameters
+    # Try reading with different parameters; every attempt parses the bytes
+    # already read instead of seeking and re-reading the upload
     for attempt_params in read_attempts:
         try:
             # Merge with user-provided kwargs
             params = {**attempt_params, **kwargs}
             
-            # Reset file pointer
-            if hasattr(uploaded_file, 'seek'):
-                uploaded_file.seek(0)
-            
             # Try to read
-            df = pd.read_csv(uploaded_file, **params)
+            df = pd.read_csv(io.BytesIO(file_content), **params)
             
             # Validate the result
             if df is not None and not df.empty and len(df.columns) > 0:
@@ -12,6 +12,7 @@ from datetime import datetime, date
 from csv_reader_utils import robust_read_csv, get_csv_info
 import json
 import re
+import hashlib
 
 # Import our SQL Agent for schema info
 from sql_agent import SQLAgent
@@ -79,6 +80,11 @@ def get_all_databases():
         }
     return {}
 
+def get_upload_file_key(uploaded_file):
+    """Get a stable, content-based key for an uploaded file"""
+    digest = hashlib.blake2b(uploaded_file.getvalue(), digest_size=16).hexdigest()
+    return f"{uploaded_file.name}_{digest}"
+
 def get_table_data(table_name, limit=100, db_path=None, offset=0):
     """Get data from a table with pagination"""
     conn = get_db_connection(db_path)
@@ -1855,7 +1861,17 @@ DELETE FROM {tables[0] if tables else 'table_name'} WHERE condition;
                 accept_multiple_files=True,
                 help="Select CSV or Excel files. Each Excel sheet will become a separate table."
             )
-        
+
+            # Hash each file's content once per run
+            file_keys = {id(f): get_upload_file_key(f) for f in (uploaded_files or [])}
+
+            # Drop configs for files that are no longer in the uploader
+            if 'file_configs' in st.session_state:
+                current_keys = set(file_keys.values())
+                for stale_key in list(st.session_state.file_configs):
+                    if stale_key not in current_keys:
+                        del st.session_state.file_configs[stale_key]
+
             if uploaded_files:
                 st.subheader("📋 File Analysis & Configuration")
                 
@@ -1864,8 +1880,9 @@ DELETE FROM {tables[0] if tables else 'table_name'} WHERE condition;
                     st.session_state.file_configs = {}
                 
                 for file in uploaded_files:
+                    file_base = file.name.rsplit('.', 1)[0].lower()
                     with st.expander(f"📄 {file.name}", expanded=True):
-                        file_key = f"{file.name}_{file.size}"
+                        file_key = file_keys[id(file)]
                         
                         # Initialize config for this file
                         if file_key not in st.session_state.file_configs:
@@ -1886,10 +1903,9 @@ DELETE FROM {tables[0] if tables else 'table_name'} WHERE condition;
                                 sheets_info = [{'name': 'CSV Data', 'rows': len(df), 'columns': len(df.columns)}]
                                 
                                 # Table name configuration
-                                default_name = file.name.split('.')[0].lower()
                                 table_name = st.text_input(
                                     f"Table name for {file.name}:",
-                                    value=st.session_state.file_configs[file_key]['table_name_override'] or default_name,
+                                    value=st.session_state.file_configs[file_key]['table_name_override'] or file_base,
                                     key=f"table_name_{file_key}"
                                 )
                                 st.session_state.file_configs[file_key]['table_name_override'] = table_name
@@ -1927,7 +1943,7 @@ DELETE FROM {tables[0] if tables else 'table_name'} WHERE condition;
                                         
                                         col_a, col_b = st.columns([2, 1])
                                         with col_a:
-                                            default_table_name = f"{file.name.split('.')[0].lower()}_{sheet_name.lower()}"
+                                            default_table_name = f"{file_base}_{sheet_name.lower()}"
                                             table_name = st.text_input(
                                                 f"Table name for sheet '{sheet_name}':",
                                                 value=st.session_state.file_configs[file_key]['sheets_config'].get(sheet_name, default_table_name),
@@ -1941,10 +1957,9 @@ DELETE FROM {tables[0] if tables else 'table_name'} WHERE condition;
                                 else:
                                     # Single sheet Excel
                                     sheet_name = sheets_info[0]['name']
-                                    default_name = file.name.split('.')[0].lower()
                                     table_name = st.text_input(
                                         f"Table name for {file.name}:",
-                                        value=st.session_state.file_configs[file_key]['table_name_override'] or default_name,
+                                        value=st.session_state.file_configs[file_key]['table_name_override'] or file_base,
                                         key=f"single_table_name_{file_key}"
                                     )
                                     st.session_state.file_configs[file_key]['table_name_override'] = table_name
@@ -2039,9 +2054,19 @@ DELETE FROM {tables[0] if tables else 'table_name'} WHERE condition;
                             except:
                                 total_operations += 1
                 
+                    # Names handed out in this upload, so collisions resolve without
+                    # waiting for each table to be created
+                    reserved_tables = set()
+                    
+                    def reserve_table_name(base_name):
+                        unique_name = file_manager.get_unique_table_name(base_name, reserved=reserved_tables)
+                        reserved_tables.add(unique_name.lower())
+                        return unique_name
+                    
                     # Process each file
                     for file in uploaded_files:
-                        file_key = f"{file.name}_{file.size}"
+                        file_base = file.name.rsplit('.', 1)[0].lower()
+                        file_key = file_keys[id(file)]
                         file_config = st.session_state.file_configs.get(file_key, {})
                         
                         status_text.text(f"📄 Processing {file.name}...")
@@ -2074,11 +2099,11 @@ DELETE FROM {tables[0] if tables else 'table_name'} WHERE condition;
                                             df_sheet = pd.read_excel(file, sheet_name=sheet_name)
                                             if table_override:
                                                 sanitized_name = file_manager.sanitize_table_name(table_override)
-                                                unique_name = file_manager.get_unique_table_name(sanitized_name)
+                                                unique_name = reserve_table_name(sanitized_name)
                                             else:
-                                                base_name = f"{file.name.split('.')[0]}_{sheet_name}"
+                                                base_name = f"{file_base}_{sheet_name}"
                                                 sanitized_name = file_manager.sanitize_table_name(base_name)
-                                                unique_name = file_manager.get_unique_table_name(sanitized_name)
+                                                unique_name = reserve_table_name(sanitized_name)
                                             
                                             success, message = file_manager.create_table_from_dataframe(df_sheet, unique_name)
                                             
@@ -2137,9 +2162,13 @@ DELETE FROM {tables[0] if tables else 'table_name'} WHERE condition;
                     with results_container:
                         st.subheader("📊 Upload Results")
                         
-                        success_count = sum(1 for r in all_results if r['success'])
-                        total_count = len(all_results)
-                        
+                        # Compute summary metrics in a single columnar pass
+                        results_df = pd.DataFrame(all_results, columns=['success', 'rows'])
+                        success_mask = results_df['success'].astype(bool)
+                        success_count = int(success_mask.sum())
+                        total_count = len(results_df)
+                        total_rows = int(results_df.loc[success_mask, 'rows'].sum())
+
                         # Summary metrics
                         col1, col2, col3, col4 = st.columns(4)
                         with col1:
@@ -2149,7 +2178,6 @@ DELETE FROM {tables[0] if tables else 'table_name'} WHERE condition;
                         with col3:
                             st.metric("📁 Files Processed", len(uploaded_files))
                         with col4:
-                            total_rows = sum(r['rows'] for r in all_results if r['success'])
                             st.metric("📊 Total Rows", total_rows)
                         
                         # Detailed results
@@ -2172,7 +2200,7 @@ DELETE FROM {tables[0] if tables else 'table_name'} WHERE condition;
                         
                         # Clear file configs after successful upload
                         if success_count > 0:
-                            st.session_state.file_configs = {}
+                            st.session_state.pop('file_configs', None)
         else:
             st.info("� Please select or create a database first to upload files.")
             
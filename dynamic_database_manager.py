@@ -12,10 +12,46 @@ import json
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple, Union
 import logging
+import logging.handlers
+import hashlib
+import atexit
 from datetime import datetime
 import shutil
 import threading
 import time
+import queue
+import re
+import bisect
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+# Matches a single-column ORDER BY usable as a keyset pagination cursor
+ORDER_BY_COLUMN_PATTERN = re.compile(r'^\s*(\w+)(?:\s+(ASC|DESC))?\s*$', re.IGNORECASE)
+
+# ALTER TABLE ... DROP COLUMN is available from SQLite 3.35
+SUPPORTS_DROP_COLUMN = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Allowed shape of a caller-supplied ORDER BY clause: column [ASC|DESC], ...
+ORDER_BY_PATTERN = re.compile(r'^[\w,\s]+$')
+
+# Leading "CREATE TABLE <name>" of a stored table definition, in any quoting style
+CREATE_TABLE_PATTERN = re.compile(
+    r'^\s*CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?(?:"(?:[^"]|"")+"|\[[^\]]+\]|`[^`]+`|[^\s(]+)',
+    re.IGNORECASE
+)
+
+# Quoted literals/identifiers (kept verbatim) or whitespace runs (collapsed)
+QUERY_WHITESPACE_PATTERN = re.compile(r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\")|\s+")
+
+# Background thread that writes queued log records; shared by every manager
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+# Column compared in a WHERE clause: "col = ?", "col LIKE ...", "col IN (...)" etc.
+WHERE_COLUMN_PATTERN = re.compile(r'\b(\w+)\s*(?:=|<|>|!=|\bLIKE\b|\bIN\b|\bBETWEEN\b|\bIS\b)', re.IGNORECASE)
+
+# String literals, which must not be mistaken for column names
+STRING_LITERAL_PATTERN = re.compile(r"'(?:[^']|'')*'")
 
 class DynamicDatabaseManager:
     """
@@ -23,6 +59,30 @@ class DynamicDatabaseManager:
     tables, and records with real-time updates to the AI system
     """
     
+    # Number of idle read connections kept per database
+    READ_POOL_SIZE = 4
+    
+    # Seconds a cached view_data() row count stays valid
+    COUNT_CACHE_TTL = 30
+    
+    # Maximum number of cached SELECT results from execute_custom_query()
+    QUERY_CACHE_SIZE = 512
+    
+    # Larger SELECT results are returned but not kept in the result cache
+    QUERY_CACHE_MAX_ROWS = 10000
+    
+    # Rows pulled per fetchmany() call when reading result sets
+    FETCH_BATCH_SIZE = 1000
+    
+    # Most recent changes kept in memory; older ones live only in changes.jsonl
+    CHANGE_LOG_SIZE = 10000
+    
+    # Extra changes let in before the oldest are dropped in one go
+    CHANGE_LOG_TRIM = 1000
+    
+    # view_data() calls on the same filter/sort columns before they get an index
+    AUTO_INDEX_THRESHOLD = 5
+    
     def __init__(self, base_path: str = "database"):
         self.base_path = Path(base_path)
         self.base_path.mkdir(exist_ok=True)
@@ -30,9 +90,51 @@ class DynamicDatabaseManager:
         # Cache for database schemas and metadata
         self.schema_cache = {}
         self.metadata_cache = {}
+        self._table_names: Dict[str, set] = {}
+        self._cache_lock = threading.Lock()
         
-        # Change tracking for AI system updates
+        # Change tracking for AI system updates, archived to an append-only file
         self.change_log = []
+        self._ts_index = []
+        self.change_log_file = self.base_path / "changes.jsonl"
+        self._change_log_handle = None
+        self._change_log_lock = threading.Lock()
+        
+        # Database files already switched to WAL journaling
+        self._pragma_applied = set()
+        
+        # Connection pools: N readers and one serialized writer per database
+        self._pools: Dict[str, queue.Queue] = {}
+        self._writer_conn: Dict[str, sqlite3.Connection] = {}
+        self._writer_locks: Dict[str, threading.RLock] = {}
+        self._pool_lock = threading.Lock()
+        atexit.register(self.close_all)
+        
+        # (database, table, column set, id column) -> (SQL, column order)
+        self._stmt_cache: Dict[Tuple[str, str, frozenset, Optional[str]], Tuple[str, Tuple[str, ...]]] = {}
+        
+        # (database, table, column) -> whether keyset paging can seek on the column
+        self._unique_keys: Dict[Tuple[str, str, str], bool] = {}
+        
+        # (database, table, where_clause) -> (row count, cached at)
+        self._count_cache: Dict[Tuple[str, str, str], Tuple[int, float]] = {}
+        
+        # LRU of SELECT results, keyed by database generation and normalized query
+        self._query_cache: OrderedDict = OrderedDict()
+        self._db_generation: Dict[str, int] = {}
+        self._query_cache_lock = threading.Lock()
+        
+        # (database, table, index columns) -> view_data() calls; indexed keys are remembered
+        self._query_usage: Counter = Counter()
+        self._auto_indexes = set()
+        self._usage_lock = threading.Lock()
+        
+        # Persisted per-table row counts, validated against each file's fingerprint
+        self.metrics_file = self.base_path / "table_metrics.json"
+        self._table_metrics = self._load_table_metrics()
+        
+        # database -> (fingerprint, tables) from the last get_all_databases() scan
+        self._scan_cache: Dict[str, Tuple[List, List[Dict[str, Any]]]] = {}
         
         # Setup logging
         self.setup_logging()
@@ -41,18 +143,297 @@ class DynamicDatabaseManager:
         self.refresh_all_database_info()
     
     def setup_logging(self):
-        """Setup logging for database operations"""
-        log_file = self.base_path / "database_operations.log"
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file),
-                logging.StreamHandler()
-            ]
-        )
+        """
+        Setup logging for database operations
+        
+        Records are handed to a queue and written to the file and console by
+        a background listener, so logging never blocks on disk I/O.
+        """
+        global _log_listener
+        
+        if _log_listener is None:
+            log_file = self.base_path / "database_operations.log"
+            formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+            handlers = [logging.FileHandler(log_file), logging.StreamHandler()]
+            for handler in handlers:
+                handler.setFormatter(formatter)
+            
+            log_queue = queue.Queue(-1)
+            _log_listener = logging.handlers.QueueListener(log_queue, *handlers)
+            _log_listener.start()
+            atexit.register(_log_listener.stop)
+            
+            logging.basicConfig(
+                level=logging.INFO,
+                format='%(message)s',
+                handlers=[logging.handlers.QueueHandler(log_queue)]
+            )
+        
         self.logger = logging.getLogger(__name__)
     
+    def _connect(self, db_path: Path, *, readonly: bool = False) -> sqlite3.Connection:
+        """
+        Open a connection with WAL journaling and tuned PRAGMAs applied
+        """
+        if readonly:
+            # Readers share one page cache; the writer keeps a private one
+            conn = sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro&cache=shared",
+                                   uri=True, check_same_thread=False)
+        else:
+            conn = sqlite3.connect(db_path, check_same_thread=False)
+            
+            # journal_mode is persistent, so only switch each file once
+            path_key = str(db_path)
+            if path_key not in self._pragma_applied:
+                conn.execute("PRAGMA journal_mode=WAL")
+                self._pragma_applied.add(path_key)
+            
+            conn.execute("PRAGMA synchronous=NORMAL")
+        
+        # The remaining PRAGMAs are per-connection
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-65536")
+        conn.execute("PRAGMA mmap_size=268435456")
+        return conn
+    
+    @contextmanager
+    def _checkout(self, db_path: Path, write: bool = False):
+        """
+        Borrow a pooled connection for a database
+        
+        Readers come from a bounded queue; the writer is a single connection
+        serialized by a per-database lock. Writes commit on success and roll
+        back on error.
+        """
+        path_key = str(db_path)
+        
+        with self._pool_lock:
+            pool = self._pools.setdefault(path_key, queue.Queue(maxsize=self.READ_POOL_SIZE))
+            writer_lock = self._writer_locks.setdefault(path_key, threading.RLock())
+        
+        if write:
+            with writer_lock:
+                conn = self._writer_conn.get(path_key)
+                if conn is None:
+                    conn = self._connect(db_path)
+                    self._writer_conn[path_key] = conn
+                conn.row_factory = None
+                try:
+                    yield conn
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+            return
+        
+        try:
+            conn = pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect(db_path, readonly=True)
+        conn.row_factory = None
+        
+        try:
+            yield conn
+        finally:
+            try:
+                pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+    
+    def _invalidate_pool(self, db_path: Path):
+        """
+        Close all pooled connections for a database after a schema change
+        """
+        path_key = str(db_path)
+        
+        with self._pool_lock:
+            pool = self._pools.pop(path_key, None)
+            writer_lock = self._writer_locks.get(path_key)
+        
+        if pool is not None:
+            while True:
+                try:
+                    pool.get_nowait().close()
+                except queue.Empty:
+                    break
+        
+        if writer_lock is not None:
+            with writer_lock:
+                conn = self._writer_conn.pop(path_key, None)
+                if conn is not None:
+                    conn.close()
+    
+    def close_all(self):
+        """
+        Close every pooled reader and writer connection
+        
+        Closing the last connection to a database checkpoints its WAL, so no
+        -wal/-shm files are left behind. Registered to run at exit.
+        """
+        with self._pool_lock:
+            path_keys = set(self._pools) | set(self._writer_conn)
+        
+        for path_key in path_keys:
+            self._invalidate_pool(Path(path_key))
+    
+    def _invalidate_count(self, database_name: str, table_name: str = None):
+        """
+        Drop cached row counts for a table, or for every table in a database
+        """
+        for key in list(self._count_cache):
+            if key[0] == database_name and (table_name is None or key[1] == table_name):
+                self._count_cache.pop(key, None)
+    
+    def _invalidate_unique_keys(self, database_name: str, table_name: str = None):
+        """
+        Drop remembered keyset columns for a table, or for every table in a database
+        """
+        for key in list(self._unique_keys):
+            if key[0] == database_name and (table_name is None or key[1] == table_name):
+                self._unique_keys.pop(key, None)
+    
+    def _bump_generation(self, database_name: str):
+        """
+        Mark a database as modified so cached query results for it go stale
+        """
+        self._db_generation[database_name] = self._db_generation.get(database_name, 0) + 1
+    
+    def _quote_ident(self, name: str) -> str:
+        """
+        Quote an SQL identifier so it can never be parsed as SQL
+        """
+        return '"' + str(name).replace('"', '""') + '"'
+    
+    def _validate_table(self, database_name: str, table_name: str):
+        """
+        Check that a table exists before its name is placed into SQL
+        
+        Uses the cached table names, re-reading the database once on a miss
+        in case the table was created after the last refresh.
+        """
+        names = self._table_names.get(database_name)
+        if names is not None and table_name in names:
+            return
+        
+        tables = self.get_tables_in_database(database_name)
+        names = {t['name'] for t in tables}
+        with self._cache_lock:
+            self.schema_cache[database_name] = tables
+            self._table_names[database_name] = names
+        
+        if table_name not in names:
+            raise ValueError(f"Table {table_name} not found in {database_name}")
+    
+    def _validate_columns(self, database_name: str, table_name: str, columns):
+        """
+        Check that every column exists in the cached schema of a table
+        
+        Like _validate_table, the database is re-read once on a miss.
+        """
+        def unknown_columns():
+            tables = self.schema_cache.get(database_name) or []
+            table_info = next((t for t in tables if t['name'] == table_name), None)
+            if table_info is None:
+                return set(columns)
+            return set(columns) - {col['name'] for col in table_info['columns']}
+        
+        if not unknown_columns():
+            return
+        
+        tables = self.get_tables_in_database(database_name)
+        with self._cache_lock:
+            self.schema_cache[database_name] = tables
+            self._table_names[database_name] = {t['name'] for t in tables}
+        
+        missing = unknown_columns()
+        if missing:
+            raise ValueError(f"Unknown columns for {database_name}.{table_name}: {', '.join(sorted(missing))}")
+    
+    def _build_order_by(self, order_by: str) -> str:
+        """
+        Validate an ORDER BY clause and return it with quoted column names
+        """
+        if not ORDER_BY_PATTERN.match(order_by):
+            raise ValueError(f"Invalid order_by clause: {order_by}")
+        
+        terms = []
+        for part in order_by.split(','):
+            tokens = part.split()
+            if not tokens or len(tokens) > 2 or (len(tokens) == 2 and tokens[1].upper() not in ('ASC', 'DESC')):
+                raise ValueError(f"Invalid order_by clause: {order_by}")
+            terms.append(' '.join([self._quote_ident(tokens[0])] + [t.upper() for t in tokens[1:]]))
+        return ', '.join(terms)
+    
+    def _db_fingerprint(self, db_path: Path, db_stat: os.stat_result = None) -> List[Optional[List[int]]]:
+        """
+        Return the (mtime, size) of a database file and its WAL file
+        
+        Any committed write changes one of them, including writes made
+        outside this manager. ``db_stat`` saves a syscall when the caller
+        already has the database file's stat.
+        """
+        fingerprint = []
+        for path, stat in ((db_path, db_stat), (Path(f"{db_path}-wal"), None)):
+            try:
+                stat = stat or path.stat()
+                fingerprint.append([stat.st_mtime_ns, stat.st_size])
+            except FileNotFoundError:
+                fingerprint.append(None)
+        return fingerprint
+    
+    def _query_cache_key(self, database_name: str, db_path: Path, query: str) -> Tuple:
+        """
+        Build the result-cache key for a read-only query
+        """
+        fingerprint = tuple(tuple(f) if f else None for f in self._db_fingerprint(db_path))
+        normalized = QUERY_WHITESPACE_PATTERN.sub(lambda m: m.group(1) or ' ', query).strip()
+        return (database_name, self._db_generation.get(database_name, 0),
+                fingerprint, normalized)
+    
+    def _load_table_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Load persisted table row counts
+        """
+        if not self.metrics_file.exists():
+            return {}
+        
+        try:
+            with open(self.metrics_file, 'r') as f:
+                return json.load(f)
+        except Exception:
+            return {}
+    
+    def _save_table_metrics(self):
+        """
+        Persist table row counts so the next start can skip COUNT(*) scans
+        """
+        try:
+            with open(self.metrics_file, 'w') as f:
+                json.dump(self._table_metrics, f)
+        except Exception as e:
+            self.logger.warning(f"Could not save table metrics: {e}")
+    
+    def _update_row_count(self, database_name: str, db_path: Path,
+                          fingerprint_before: List, table_name: str = None, delta: int = 0):
+        """
+        Apply a row-count delta after a write made through this manager
+        
+        If the stored counts were already stale, or the change cannot be
+        attributed to one table, the database's counts are dropped and
+        recounted on the next scan.
+        """
+        metrics = self._table_metrics.get(database_name)
+        if metrics is None:
+            return
+        
+        if (table_name is None or metrics['fingerprint'] != fingerprint_before
+                or table_name not in metrics['tables']):
+            self._table_metrics.pop(database_name, None)
+            return
+        
+        metrics['tables'][table_name] += delta
+        metrics['fingerprint'] = self._db_fingerprint(db_path)
+    
     def log_change(self, operation: str, database: str, table: str = None, details: dict = None):
         """Log database changes for AI system updates"""
         change_record = {
@@ -62,22 +443,83 @@ class DynamicDatabaseManager:
             'table': table,
             'details': details or {}
         }
-        self.change_log.append(change_record)
+        line = json.dumps(change_record, default=str) + "\n"
+        
+        with self._change_log_lock:
+            self.change_log.append(change_record)
+            self._ts_index.append(change_record['timestamp'])
+            
+            # Lists rather than bounded deques, so get_change_log() can bisect
+            # without O(n) indexing; trimmed a chunk at a time
+            excess = len(self.change_log) - self.CHANGE_LOG_SIZE
+            if excess > self.CHANGE_LOG_TRIM:
+                del self.change_log[:excess]
+                del self._ts_index[:excess]
+            
+            try:
+                if self._change_log_handle is None:
+                    self._change_log_handle = open(self.change_log_file, 'a', buffering=1 << 16)
+                    atexit.register(self._close_change_log)
+                self._change_log_handle.write(line)
+            except Exception as e:
+                self.logger.warning(f"Could not archive change record: {e}")
+        
         self.logger.info(f"Database change: {operation} on {database}.{table if table else 'DATABASE'}")
     
+    def _close_change_log(self):
+        """Flush buffered change records to changes.jsonl and close the file"""
+        with self._change_log_lock:
+            if self._change_log_handle is not None:
+                self._change_log_handle.close()
+                self._change_log_handle = None
+    
+    def _inspect_db(self, entry: os.DirEntry) -> Tuple[str, Dict[str, Any]]:
+        """
+        Collect metadata for a single database file
+        
+        Table details are reused from the previous scan while the file's
+        fingerprint is unchanged.
+        """
+        db_name = entry.name[:-len('.db')]
+        db_file = Path(entry.path)
+        stat = entry.stat()
+        fingerprint = self._db_fingerprint(db_file, stat)
+        
+        cached = self._scan_cache.get(db_name)
+        if cached is not None and cached[0] == fingerprint:
+            tables = cached[1]
+        else:
+            tables = self.get_tables_in_database(db_name)
+            self._scan_cache[db_name] = (fingerprint, tables)
+        
+        return db_name, {
+            'path': str(db_file),
+            'size': stat.st_size,
+            'modified': datetime.fromtimestamp(stat.st_mtime).isoformat(),
+            'mtime_raw': stat.st_mtime,
+            'tables': tables
+        }
+    
     def get_all_databases(self) -> Dict[str, Dict[str, Any]]:
         """Discover and return all available databases with metadata"""
-        databases = {}
-        
-        # Scan database directory for .db files
-        for db_file in self.base_path.glob("*.db"):
-            db_name = db_file.stem
-            databases[db_name] = {
-                'path': str(db_file),
-                'size': db_file.stat().st_size,
-                'modified': datetime.fromtimestamp(db_file.stat().st_mtime).isoformat(),
-                'tables': self.get_tables_in_database(db_name)
-            }
+        # Scan database directory for .db files; DirEntry caches each stat
+        with os.scandir(self.base_path) as it:
+            entries = [entry for entry in it if entry.name.endswith('.db') and entry.is_file()]
+        if not entries:
+            self._scan_cache.clear()
+            return {}
+        
+        # Forget databases that were deleted since the last scan
+        names = {entry.name[:-len('.db')] for entry in entries}
+        for db_name in list(self._scan_cache):
+            if db_name not in names:
+                self._scan_cache.pop(db_name, None)
+        
+        # Each file is independent and I/O bound, so inspect them concurrently
+        with ThreadPoolExecutor(max_workers=min(32, len(entries))) as executor:
+            databases = dict(executor.map(self._inspect_db, entries))
+        
+        self._save_table_metrics()
         
         return databases
     
@@ -88,9 +530,15 @@ class DynamicDatabaseManager:
         if not db_path.exists():
             return []
         
+        # Reuse persisted row counts if the file is unchanged since they were taken
+        fingerprint = self._db_fingerprint(db_path)
+        metrics = self._table_metrics.get(database_name)
+        known_counts = metrics['tables'] if metrics and metrics['fingerprint'] == fingerprint else {}
+        row_counts = {}
+        
         tables = []
         try:
-            with sqlite3.connect(db_path) as conn:
+            with self._checkout(db_path) as conn:
                 cursor = conn.cursor()
                 
                 # Get all tables
@@ -102,12 +550,15 @@ class DynamicDatabaseManager:
                 
                 for (table_name,) in cursor.fetchall():
                     # Get table info
-                    cursor.execute(f"PRAGMA table_info({table_name})")
+                    cursor.execute(f"PRAGMA table_info({self._quote_ident(table_name)})")
                     columns = cursor.fetchall()
                     
                     # Get row count
-                    cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-                    row_count = cursor.fetchone()[0]
+                    row_count = known_counts.get(table_name)
+                    if row_count is None:
+                        cursor.execute(f"SELECT COUNT(*) FROM {self._quote_ident(table_name)}")
+                        row_count = cursor.fetchone()[0]
+                    row_counts[table_name] = row_count
                     
                     table_info = {
                         'name': table_name,
@@ -125,18 +576,243 @@ class DynamicDatabaseManager:
                         'row_count': row_count
                     }
                     tables.append(table_info)
+            
+            self._table_metrics[database_name] = {
+                'fingerprint': fingerprint,
+                'tables': row_counts,
+                'updated_at': datetime.now().isoformat()
+            }
                     
         except Exception as e:
             self.logger.error(f"Error reading tables from {database_name}: {e}")
         
         return tables
     
+    def _get_primary_key(self, conn: sqlite3.Connection, database_name: str,
+                         table_name: str) -> Optional[str]:
+        """
+        Return the single-column primary key of a table, if it has one
+        """
+        tables = self.schema_cache.get(database_name, [])
+        table_info = next((t for t in tables if t['name'] == table_name), None)
+        
+        if table_info is not None:
+            pk_columns = [col['name'] for col in table_info['columns'] if col['primary_key']]
+        else:
+            columns = conn.execute(f"PRAGMA table_info({self._quote_ident(table_name)})").fetchall()
+            pk_columns = [col[1] for col in columns if col[5]]
+        
+        return pk_columns[0] if len(pk_columns) == 1 else None
+    
+    def _is_unique_key(self, conn: sqlite3.Connection, database_name: str,
+                       table_name: str, column: str) -> bool:
+        """
+        Check that a column is NOT NULL and unique on its own, so seeking past
+        its last value can neither skip nor repeat rows
+        
+        The answer is remembered until the table's schema changes.
+        """
+        key = (database_name, table_name, column.lower())
+        unique = self._unique_keys.get(key)
+        if unique is None:
+            unique = self._unique_keys[key] = self._read_unique_key(conn, table_name, column)
+        return unique
+    
+    def _read_unique_key(self, conn: sqlite3.Connection, table_name: str, column: str) -> bool:
+        """
+        Read from the table's PRAGMAs whether a column is a unique NOT NULL key
+        """
+        quoted_table = self._quote_ident(table_name)
+        columns = conn.execute(f"PRAGMA table_info({quoted_table})").fetchall()
+        info = next((col for col in columns if col[1].lower() == column.lower()), None)
+        if info is None:
+            return False
+        
+        # INTEGER PRIMARY KEY aliases the rowid, which is always unique and set
+        pk_columns = [col for col in columns if col[5]]
+        if info[5] and len(pk_columns) == 1 and info[2].upper() == 'INTEGER':
+            return True
+        
+        if not info[3]:
+            return False
+        
+        for index in conn.execute(f"PRAGMA index_list({quoted_table})").fetchall():
+            # (seq, name, unique, origin, partial)
+            if not index[2] or (len(index) > 4 and index[4]):
+                continue
+            index_columns = conn.execute(f"PRAGMA index_info({self._quote_ident(index[1])})").fetchall()
+            if len(index_columns) == 1 and (index_columns[0][2] or '').lower() == column.lower():
+                return True
+        
+        return False
+    
+    def _build_view_query(self, conn: sqlite3.Connection, database_name: str, table_name: str,
+                          limit: int, offset: int, where_clause: Optional[str],
+                          order_by: Optional[str], after: Optional[Any]) -> Tuple[str, List[Any], Optional[str]]:
+        """
+        Build the paged SELECT shared by view_data and view_data_df
+        
+        Returns the query, its parameters and the keyset column (if any).
+        Keyset paging is only used on a unique, NOT NULL column; ordering by
+        anything else pages with OFFSET, because rows sharing the last value
+        or holding NULL would otherwise be skipped.
+        """
+        quoted_table = self._quote_ident(table_name)
+        order_sql = self._build_order_by(order_by) if order_by else None
+        
+        # Work out the keyset column and direction
+        key_column = None
+        descending = False
+        if order_by:
+            match = ORDER_BY_COLUMN_PATTERN.match(order_by)
+            if match:
+                key_column = match.group(1)
+                descending = (match.group(2) or '').upper() == 'DESC'
+        else:
+            key_column = self._get_primary_key(conn, database_name, table_name)
+        
+        keyset_column = key_column if key_column and self._is_unique_key(conn, database_name, table_name, key_column) else None
+        
+        # Build query
+        query = f"SELECT * FROM {quoted_table}"
+        params = []
+        conditions = []
+        
+        if where_clause:
+            conditions.append(f"({where_clause})")
+        
+        if after is not None and keyset_column:
+            conditions.append(f"{self._quote_ident(keyset_column)} {'<' if descending else '>'} ?")
+            params.append(after)
+        
+        if conditions:
+            query += f" WHERE {' AND '.join(conditions)}"
+        
+        if order_sql:
+            query += f" ORDER BY {order_sql}"
+        elif key_column:
+            query += f" ORDER BY {self._quote_ident(key_column)}"
+        
+        if after is not None and keyset_column:
+            query += " LIMIT ?"
+            params.append(limit)
+        else:
+            query += " LIMIT ? OFFSET ?"
+            params.extend([limit, offset])
+        
+        return query, params, keyset_column
+    
+    def _count_rows(self, conn: sqlite3.Connection, database_name: str, table_name: str,
+                    where_clause: Optional[str]) -> int:
+        """
+        Get the total row count for pagination, reusing a recent count if cached
+        """
+        count_key = (database_name, table_name, where_clause or '')
+        cached = self._count_cache.get(count_key)
+        if cached and time.monotonic() - cached[1] < self.COUNT_CACHE_TTL:
+            return cached[0]
+        
+        count_query = f"SELECT COUNT(*) FROM {self._quote_ident(table_name)}"
+        if where_clause:
+            count_query += f" WHERE {where_clause}"
+        
+        total_rows = conn.execute(count_query).fetchone()[0]
+        self._count_cache[count_key] = (total_rows, time.monotonic())
+        return total_rows
+    
+    def _index_columns(self, database_name: str, table_name: str,
+                       where_clause: Optional[str], order_by: Optional[str]) -> Tuple[str, ...]:
+        """
+        Work out which columns an index for a filter/sort would cover
+        
+        Filtered columns come first, then sort columns; names that are not
+        real columns of the table are ignored.
+        """
+        tables = self.schema_cache.get(database_name) or []
+        table_info = next((t for t in tables if t['name'] == table_name), None)
+        if table_info is None:
+            return ()
+        
+        known = {col['name'].lower(): col['name'] for col in table_info['columns']}
+        candidates = []
+        if where_clause:
+            candidates += WHERE_COLUMN_PATTERN.findall(STRING_LITERAL_PATTERN.sub('', where_clause))
+        if order_by:
+            candidates += [part.split()[0] for part in order_by.split(',') if part.strip()]
+        
+        columns = []
+        for name in candidates:
+            column = known.get(name.lower())
+            if column and column not in columns:
+                columns.append(column)
+        
+        # A lone primary key column is already indexed
+        pk_columns = [col['name'] for col in table_info['columns'] if col['primary_key']]
+        if columns == pk_columns[:1] and len(pk_columns) == 1:
+            return ()
+        
+        return tuple(columns)
+    
+    def _track_view_usage(self, database_name: str, table_name: str, db_path: Path,
+                          where_clause: Optional[str], order_by: Optional[str]):
+        """
+        Count a filter/sort path and index it in the background once it is hot
+        """
+        columns = self._index_columns(database_name, table_name, where_clause, order_by)
+        if not columns:
+            return
+        
+        key = (database_name, table_name, columns)
+        with self._usage_lock:
+            if key in self._auto_indexes:
+                return
+            self._query_usage[key] += 1
+            if self._query_usage[key] < self.AUTO_INDEX_THRESHOLD:
+                return
+            self._auto_indexes.add(key)
+        
+        threading.Thread(target=self._create_auto_index, args=(key, db_path), daemon=True).start()
+    
+    def _create_auto_index(self, key: Tuple[str, str, Tuple[str, ...]], db_path: Path):
+        """
+        Create the index for a hot filter/sort path
+        
+        The index name is derived from the table and columns, so IF NOT EXISTS
+        makes this a no-op when the index survived a restart.
+        """
+        database_name, table_name, columns = key
+        digest = hashlib.blake2b(repr((table_name, columns)).encode(), digest_size=6).hexdigest()
+        index_name = f"idx_auto_{digest}"
+        column_sql = ', '.join(self._quote_ident(col) for col in columns)
+        
+        try:
+            fingerprint = self._db_fingerprint(db_path)
+            with self._checkout(db_path, write=True) as conn:
+                conn.execute(f"CREATE INDEX IF NOT EXISTS {self._quote_ident(index_name)} "
+                             f"ON {self._quote_ident(table_name)} ({column_sql})")
+            
+            # Row counts are unchanged, only the file fingerprint moved
+            self._update_row_count(database_name, db_path, fingerprint, table_name, 0)
+            self.logger.info(f"Created index {index_name} on {database_name}.{table_name} ({', '.join(columns)})")
+        except Exception as e:
+            with self._usage_lock:
+                self._auto_indexes.discard(key)
+                self._query_usage.pop(key, None)
+            self.logger.warning(f"Could not create index on {database_name}.{table_name}: {e}")
+    
     def view_data(self, database_name: str, table_name: str, 
                   limit: int = 100, offset: int = 0,
                   where_clause: str = None,
-                  order_by: str = None) -> Dict[str, Any]:
+                  order_by: str = None,
+                  after: Optional[Any] = None) -> Dict[str, Any]:
         """
         View data from any table in any database with flexible filtering
+        
+        Pass the previous page's ``next_cursor`` as ``after`` to seek directly
+        to the next page instead of scanning past ``offset`` rows. Keyset
+        paging needs a single unique, NOT NULL ordering column (``order_by``
+        or the primary key); ``next_cursor`` is None and OFFSET paging is
+        used otherwise.
         """
         try:
             db_path = self.base_path / f"{database_name}.db"
@@ -144,42 +820,90 @@ class DynamicDatabaseManager:
             if not db_path.exists():
                 return {'success': False, 'error': f'Database {database_name} not found'}
             
-            with sqlite3.connect(db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            self._validate_table(database_name, table_name)
+            self._track_view_usage(database_name, table_name, db_path, where_clause, order_by)
+            
+            with self._checkout(db_path) as conn:
+                query, params, key_column = self._build_view_query(
+                    conn, database_name, table_name, limit, offset, where_clause, order_by, after
+                )
                 
-                # Build query
-                query = f"SELECT * FROM {table_name}"
-                params = []
+                # Execute query
+                cursor = conn.execute(query, params)
                 
-                if where_clause:
-                    query += f" WHERE {where_clause}"
+                # Convert to list of dictionaries batch by batch
+                data = self._fetch_dicts(cursor)
                 
-                if order_by:
-                    query += f" ORDER BY {order_by}"
+                total_rows = self._count_rows(conn, database_name, table_name, where_clause)
                 
-                query += f" LIMIT {limit} OFFSET {offset}"
+                next_cursor = None
+                if key_column and data and key_column in data[-1]:
+                    next_cursor = data[-1][key_column]
                 
-                # Execute query
-                cursor = conn.execute(query, params)
-                rows = cursor.fetchall()
+                return {
+                    'success': True,
+                    'data': data,
+                    'total_rows': total_rows,
+                    'current_page': (offset // limit) + 1,
+                    'total_pages': (total_rows + limit - 1) // limit,
+                    'columns': [description[0] for description in cursor.description] if data else [],
+                    'next_cursor': next_cursor
+                }
+                
+        except Exception as e:
+            error_msg = f"Error viewing data from {database_name}.{table_name}: {e}"
+            self.logger.error(error_msg)
+            return {'success': False, 'error': error_msg}
+    
+    def view_data_df(self, database_name: str, table_name: str,
+                     limit: int = 100, offset: int = 0,
+                     where_clause: str = None,
+                     order_by: str = None,
+                     after: Optional[Any] = None) -> Dict[str, Any]:
+        """
+        Same as view_data, but returns the page as a DataFrame
+        
+        pandas builds typed columns straight from the cursor, which avoids
+        creating a dict per row when the caller wants tabular data anyway.
+        """
+        try:
+            db_path = self.base_path / f"{database_name}.db"
+            
+            if not db_path.exists():
+                return {'success': False, 'error': f'Database {database_name} not found'}
+            
+            self._validate_table(database_name, table_name)
+            self._track_view_usage(database_name, table_name, db_path, where_clause, order_by)
+            
+            with self._checkout(db_path) as conn:
+                query, params, key_column = self._build_view_query(
+                    conn, database_name, table_name, limit, offset, where_clause, order_by, after
+                )
+                
+                # Nullable dtypes keep integer columns with NULLs out of object/float
+                read_kwargs = {'params': params, 'chunksize': self.FETCH_BATCH_SIZE * 10}
+                if int(pd.__version__.split('.')[0]) >= 2:
+                    read_kwargs['dtype_backend'] = 'numpy_nullable'
                 
-                # Convert to list of dictionaries
-                data = [dict(row) for row in rows]
+                chunks = list(pd.read_sql_query(query, conn, **read_kwargs))
+                df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
                 
-                # Get total count for pagination
-                count_query = f"SELECT COUNT(*) FROM {table_name}"
-                if where_clause:
-                    count_query += f" WHERE {where_clause}"
+                total_rows = self._count_rows(conn, database_name, table_name, where_clause)
                 
-                total_rows = conn.execute(count_query).fetchone()[0]
+                next_cursor = None
+                if key_column and not df.empty and key_column in df.columns:
+                    next_cursor = df[key_column].iloc[-1]
+                    if hasattr(next_cursor, 'item'):
+                        next_cursor = next_cursor.item()
                 
                 return {
                     'success': True,
-                    'data': data,
+                    'data': df,
                     'total_rows': total_rows,
                     'current_page': (offset // limit) + 1,
                     'total_pages': (total_rows + limit - 1) // limit,
-                    'columns': [description[0] for description in cursor.description] if rows else []
+                    'columns': list(df.columns),
+                    'next_cursor': next_cursor
                 }
                 
         except Exception as e:
@@ -187,49 +911,132 @@ class DynamicDatabaseManager:
             self.logger.error(error_msg)
             return {'success': False, 'error': error_msg}
     
+    def _prepare_insert(self, database_name: str, table_name: str,
+                        columns: Tuple[str, ...]) -> Tuple[str, Tuple[str, ...]]:
+        """
+        Return the cached INSERT statement and column order for a set of columns
+        
+        Identical SQL text also hits sqlite3's per-connection statement cache
+        on the pooled writer, so SQLite skips re-parsing.
+        """
+        key = (database_name, table_name, frozenset(columns), None)
+        cached = self._stmt_cache.get(key)
+        if cached is None:
+            placeholders = ', '.join(['?' for _ in columns])
+            column_list = ', '.join(self._quote_ident(col) for col in columns)
+            query = f"INSERT INTO {self._quote_ident(table_name)} ({column_list}) VALUES ({placeholders})"
+            cached = self._stmt_cache[key] = (query, tuple(columns))
+        return cached
+    
+    def _prepare_update(self, database_name: str, table_name: str,
+                        columns: Tuple[str, ...], id_column: str) -> Tuple[str, Tuple[str, ...]]:
+        """
+        Return the cached UPDATE statement and column order for a set of columns
+        """
+        key = (database_name, table_name, frozenset(columns), id_column)
+        cached = self._stmt_cache.get(key)
+        if cached is None:
+            set_clauses = [f"{self._quote_ident(col)} = ?" for col in columns]
+            query = (f"UPDATE {self._quote_ident(table_name)} SET {', '.join(set_clauses)} "
+                     f"WHERE {self._quote_ident(id_column)} = ?")
+            cached = self._stmt_cache[key] = (query, tuple(columns))
+        return cached
+    
+    def _invalidate_statements(self, database_name: str, table_name: str):
+        """
+        Drop cached statements for a table whose schema changed
+        """
+        for key in list(self._stmt_cache):
+            if key[0] == database_name and key[1] == table_name:
+                self._stmt_cache.pop(key, None)
+        
+        # Auto-created indexes may have been dropped along with the old schema
+        with self._usage_lock:
+            for key in list(self._query_usage):
+                if key[0] == database_name and key[1] == table_name:
+                    del self._query_usage[key]
+            self._auto_indexes = {key for key in self._auto_indexes
+                                  if not (key[0] == database_name and key[1] == table_name)}
+        
+        self._invalidate_unique_keys(database_name, table_name)
+    
     def add_record(self, database_name: str, table_name: str, 
                    record_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Add a new record to any table in any database
         """
+        result = self.add_records(database_name, table_name, [record_data])
+        
+        if not result['success']:
+            return result
+        
+        return {
+            'success': True,
+            'message': f'Record added successfully to {database_name}.{table_name}',
+            'inserted_id': result['inserted_id']
+        }
+    
+    def add_records(self, database_name: str, table_name: str,
+                    records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Add many records to a table in a single transaction
+        """
         try:
             db_path = self.base_path / f"{database_name}.db"
             
             if not db_path.exists():
                 return {'success': False, 'error': f'Database {database_name} not found'}
             
-            with sqlite3.connect(db_path) as conn:
-                # Get table schema to validate data
+            self._validate_table(database_name, table_name)
+            
+            # Group records by column set so each group shares one prepared INSERT
+            groups: Dict[frozenset, List[Dict[str, Any]]] = {}
+            for record in records:
+                groups.setdefault(frozenset(record), []).append(record)
+            
+            for columns in groups:
+                self._validate_columns(database_name, table_name, columns)
+            
+            inserted_id = None
+            fingerprint = self._db_fingerprint(db_path)
+            with self._checkout(db_path, write=True) as conn:
                 cursor = conn.cursor()
-                cursor.execute(f"PRAGMA table_info({table_name})")
-                columns_info = cursor.fetchall()
                 
-                # Build insert query
-                columns = list(record_data.keys())
-                placeholders = ', '.join(['?' for _ in columns])
-                values = list(record_data.values())
-                
-                query = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})"
+                for group in groups.values():
+                    query, col_order = self._prepare_insert(database_name, table_name, tuple(group[0]))
+                    
+                    if len(group) == 1:
+                        cursor.execute(query, tuple(group[0][c] for c in col_order))
+                        inserted_id = cursor.lastrowid
+                    else:
+                        cursor.executemany(query, [tuple(r[c] for c in col_order) for r in group])
                 
-                cursor.execute(query, values)
                 conn.commit()
-                
-                inserted_id = cursor.lastrowid
-                
-                # Log the change
+            
+            self._invalidate_count(database_name, table_name)
+            self._bump_generation(database_name)
+            self._update_row_count(database_name, db_path, fingerprint, table_name, len(records))
+            
+            # Log the change
+            if len(records) == 1:
                 self.log_change('INSERT', database_name, table_name, {
                     'record_id': inserted_id,
-                    'data': record_data
+                    'data': records[0]
                 })
-                
-                return {
-                    'success': True,
-                    'message': f'Record added successfully to {database_name}.{table_name}',
-                    'inserted_id': inserted_id
-                }
-                
+            else:
+                self.log_change('INSERT_BATCH', database_name, table_name, {
+                    'record_count': len(records)
+                })
+            
+            return {
+                'success': True,
+                'message': f'{len(records)} records added successfully to {database_name}.{table_name}',
+                'inserted_count': len(records),
+                'inserted_id': inserted_id
+            }
+            
         except Exception as e:
-            error_msg = f"Error adding record to {database_name}.{table_name}: {e}"
+            error_msg = f"Error adding records to {database_name}.{table_name}: {e}"
             self.logger.error(error_msg)
             return {'success': False, 'error': error_msg}
     
@@ -245,18 +1052,23 @@ class DynamicDatabaseManager:
             if not db_path.exists():
                 return {'success': False, 'error': f'Database {database_name} not found'}
             
-            with sqlite3.connect(db_path) as conn:
+            self._validate_table(database_name, table_name)
+            
+            fingerprint = self._db_fingerprint(db_path)
+            with self._checkout(db_path, write=True) as conn:
                 # Build update query
-                set_clauses = [f"{col} = ?" for col in record_data.keys()]
-                values = list(record_data.values()) + [record_id]
-                
-                query = f"UPDATE {table_name} SET {', '.join(set_clauses)} WHERE {id_column} = ?"
+                query, col_order = self._prepare_update(database_name, table_name,
+                                                        tuple(record_data), id_column)
+                values = [record_data[c] for c in col_order] + [record_id]
                 
                 cursor = conn.cursor()
                 cursor.execute(query, values)
                 conn.commit()
                 
                 affected_rows = cursor.rowcount
+                self._invalidate_count(database_name, table_name)
+                self._bump_generation(database_name)
+                self._update_row_count(database_name, db_path, fingerprint, table_name)
                 
                 # Log the change
                 self.log_change('UPDATE', database_name, table_name, {
@@ -287,18 +1099,27 @@ class DynamicDatabaseManager:
             if not db_path.exists():
                 return {'success': False, 'error': f'Database {database_name} not found'}
             
-            with sqlite3.connect(db_path) as conn:
+            self._validate_table(database_name, table_name)
+            quoted_table = self._quote_ident(table_name)
+            quoted_id = self._quote_ident(id_column)
+            
+            fingerprint = self._db_fingerprint(db_path)
+            with self._checkout(db_path, write=True) as conn:
+                conn.row_factory = sqlite3.Row
                 cursor = conn.cursor()
                 
                 # Get record before deletion for logging
-                cursor.execute(f"SELECT * FROM {table_name} WHERE {id_column} = ?", (record_id,))
+                cursor.execute(f"SELECT * FROM {quoted_table} WHERE {quoted_id} = ?", (record_id,))
                 deleted_record = cursor.fetchone()
                 
                 # Delete record
-                cursor.execute(f"DELETE FROM {table_name} WHERE {id_column} = ?", (record_id,))
+                cursor.execute(f"DELETE FROM {quoted_table} WHERE {quoted_id} = ?", (record_id,))
                 conn.commit()
                 
                 affected_rows = cursor.rowcount
+                self._invalidate_count(database_name, table_name)
+                self._bump_generation(database_name)
+                self._update_row_count(database_name, db_path, fingerprint, table_name, -affected_rows)
                 
                 # Log the change
                 self.log_change('DELETE_RECORD', database_name, table_name, {
@@ -318,11 +1139,48 @@ class DynamicDatabaseManager:
             self.logger.error(error_msg)
             return {'success': False, 'error': error_msg}
     
+    def _rebuild_without_column(self, cursor: sqlite3.Cursor, table_name: str,
+                                remaining_columns: List[Tuple]):
+        """
+        Recreate a table without one column by copying it into a new table
+        """
+        quoted_table = self._quote_ident(table_name)
+        
+        # Create new table schema
+        column_definitions = []
+        for col in remaining_columns:
+            definition = f"{self._quote_ident(col[1])} {col[2]}"
+            if col[3]:  # NOT NULL
+                definition += " NOT NULL"
+            if col[4] is not None:  # DEFAULT
+                definition += f" DEFAULT {col[4]}"
+            if col[5]:  # PRIMARY KEY
+                definition += " PRIMARY KEY"
+            column_definitions.append(definition)
+        
+        # Execute table recreation
+        temp_table = self._quote_ident(f"{table_name}_temp")
+        column_list = ', '.join(self._quote_ident(col[1]) for col in remaining_columns)
+        
+        # Create temporary table
+        create_sql = f"CREATE TABLE {temp_table} ({', '.join(column_definitions)})"
+        cursor.execute(create_sql)
+        
+        # Copy data (excluding the deleted column)
+        insert_sql = f"INSERT INTO {temp_table} SELECT {column_list} FROM {quoted_table}"
+        cursor.execute(insert_sql)
+        
+        # Drop original table and rename temp table
+        cursor.execute(f"DROP TABLE {quoted_table}")
+        cursor.execute(f"ALTER TABLE {temp_table} RENAME TO {quoted_table}")
+    
     def delete_column(self, database_name: str, table_name: str, 
                      column_name: str) -> Dict[str, Any]:
         """
         Delete a specific column from a table
-        Note: SQLite doesn't support DROP COLUMN, so we recreate the table
+        Note: Uses ALTER TABLE ... DROP COLUMN on SQLite 3.35+, and recreates
+        the table on older versions or when SQLite refuses the drop (for
+        example on PRIMARY KEY, UNIQUE or indexed columns)
         """
         try:
             db_path = self.base_path / f"{database_name}.db"
@@ -330,11 +1188,14 @@ class DynamicDatabaseManager:
             if not db_path.exists():
                 return {'success': False, 'error': f'Database {database_name} not found'}
             
-            with sqlite3.connect(db_path) as conn:
+            self._validate_table(database_name, table_name)
+            quoted_table = self._quote_ident(table_name)
+            
+            with self._checkout(db_path, write=True) as conn:
                 cursor = conn.cursor()
                 
                 # Get current table schema
-                cursor.execute(f"PRAGMA table_info({table_name})")
+                cursor.execute(f"PRAGMA table_info({quoted_table})")
                 columns = cursor.fetchall()
                 
                 # Filter out the column to delete
@@ -343,47 +1204,41 @@ class DynamicDatabaseManager:
                 if len(remaining_columns) == len(columns):
                     return {'success': False, 'error': f'Column {column_name} not found in table'}
                 
-                # Create new table schema
-                column_definitions = []
-                for col in remaining_columns:
-                    definition = f"{col[1]} {col[2]}"
-                    if col[3]:  # NOT NULL
-                        definition += " NOT NULL"
-                    if col[4] is not None:  # DEFAULT
-                        definition += f" DEFAULT {col[4]}"
-                    if col[5]:  # PRIMARY KEY
-                        definition += " PRIMARY KEY"
-                    column_definitions.append(definition)
-                
-                # Execute table recreation
-                temp_table = f"{table_name}_temp"
                 column_names = [col[1] for col in remaining_columns]
                 
-                # Create temporary table
-                create_sql = f"CREATE TABLE {temp_table} ({', '.join(column_definitions)})"
-                cursor.execute(create_sql)
+                # Drop the column in place when SQLite supports it
+                dropped = False
+                if SUPPORTS_DROP_COLUMN:
+                    try:
+                        cursor.execute(f"ALTER TABLE {quoted_table} DROP COLUMN {self._quote_ident(column_name)}")
+                        dropped = True
+                    except sqlite3.OperationalError:
+                        # Constrained or indexed columns can't be dropped in place
+                        pass
                 
-                # Copy data (excluding the deleted column)
-                insert_sql = f"INSERT INTO {temp_table} SELECT {', '.join(column_names)} FROM {table_name}"
-                cursor.execute(insert_sql)
-                
-                # Drop original table and rename temp table
-                cursor.execute(f"DROP TABLE {table_name}")
-                cursor.execute(f"ALTER TABLE {temp_table} RENAME TO {table_name}")
+                if not dropped:
+                    self._rebuild_without_column(cursor, table_name, remaining_columns)
                 
                 conn.commit()
-                
-                # Log the change
-                self.log_change('DELETE_COLUMN', database_name, table_name, {
-                    'column_name': column_name,
-                    'remaining_columns': column_names
-                })
-                
-                return {
-                    'success': True,
-                    'message': f'Column {column_name} deleted successfully from {database_name}.{table_name}'
-                }
-                
+            
+            # Schema changed, so drop pooled connections for this database
+            self._invalidate_pool(db_path)
+            self._invalidate_statements(database_name, table_name)
+            self._invalidate_count(database_name, table_name)
+            self._bump_generation(database_name)
+            self._table_metrics.pop(database_name, None)
+            
+            # Log the change
+            self.log_change('DELETE_COLUMN', database_name, table_name, {
+                'column_name': column_name,
+                'remaining_columns': column_names
+            })
+            
+            return {
+                'success': True,
+                'message': f'Column {column_name} deleted successfully from {database_name}.{table_name}'
+            }
+            
         except Exception as e:
             error_msg = f"Error deleting column from {database_name}.{table_name}: {e}"
             self.logger.error(error_msg)
@@ -401,56 +1256,161 @@ class DynamicDatabaseManager:
             if not source_path.exists():
                 return {'success': False, 'error': f'Source database {source_db} not found'}
             
-            # Create target database if it doesn't exist
-            if not target_path.exists():
-                with sqlite3.connect(target_path) as conn:
-                    pass  # Just create the file
-            
             # Attach databases and copy table
-            with sqlite3.connect(source_path) as conn:
+            conn = self._connect(source_path)
+            try:
                 cursor = conn.cursor()
                 
-                # Attach target database
-                cursor.execute(f"ATTACH DATABASE '{target_path}' AS target_db")
-                
-                # Get table schema
-                cursor.execute(f"SELECT sql FROM sqlite_master WHERE type='table' AND name='{table_name}'")
-                create_sql = cursor.fetchone()
-                
-                if not create_sql:
-                    return {'success': False, 'error': f'Table {table_name} not found in source database'}
-                
-                # Create table in target database
-                cursor.execute(create_sql[0].replace(f"CREATE TABLE {table_name}", 
-                                                    f"CREATE TABLE target_db.{table_name}"))
-                
-                # Copy data
-                cursor.execute(f"INSERT INTO target_db.{table_name} SELECT * FROM {table_name}")
+                # Create target database if it doesn't exist, sized like the source
+                if not target_path.exists():
+                    page_size = cursor.execute("PRAGMA page_size").fetchone()[0]
+                    target_conn = sqlite3.connect(target_path)
+                    target_conn.execute(f"PRAGMA page_size = {int(page_size)}")
+                    target_conn.execute("PRAGMA journal_mode=WAL")
+                    target_conn.close()
+                    self._pragma_applied.add(str(target_path))
                 
-                # Drop from source
-                cursor.execute(f"DROP TABLE {table_name}")
-                
-                conn.commit()
-                
-                # Log the change
-                self.log_change('MOVE_TABLE', source_db, table_name, {
-                    'target_database': target_db,
-                    'source_database': source_db
-                })
-                
-                return {
-                    'success': True,
-                    'message': f'Table {table_name} moved successfully from {source_db} to {target_db}'
-                }
+                # Attach target database and skip fsyncs on it during the bulk copy
+                cursor.execute("ATTACH DATABASE ? AS target_db", (str(target_path),))
+                cursor.execute("PRAGMA target_db.synchronous=OFF")
                 
+                try:
+                    # Get table schema
+                    cursor.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (table_name,))
+                    create_sql = cursor.fetchone()
+                    
+                    if not create_sql:
+                        return {'success': False, 'error': f'Table {table_name} not found in source database'}
+                    
+                    # Create, copy and drop atomically so a failure never leaves a half-moved table
+                    cursor.execute("BEGIN IMMEDIATE")
+                    try:
+                        # Create table in target database, whatever quoting the original DDL used
+                        # (a callable, so backslashes in the name are not read as escapes)
+                        quoted_table = self._quote_ident(table_name)
+                        target_create = f"CREATE TABLE target_db.{quoted_table}"
+                        cursor.execute(CREATE_TABLE_PATTERN.sub(lambda _m: target_create,
+                                                                create_sql[0], count=1))
+                        
+                        # Copy data
+                        cursor.execute(f"INSERT INTO target_db.{quoted_table} SELECT * FROM {quoted_table}")
+                        
+                        # Drop from source
+                        cursor.execute(f"DROP TABLE {quoted_table}")
+                        
+                        conn.commit()
+                    except Exception:
+                        conn.rollback()
+                        raise
+                finally:
+                    cursor.execute("PRAGMA target_db.synchronous=NORMAL")
+                    cursor.execute("DETACH DATABASE target_db")
+            finally:
+                conn.close()
+            
+            # Both schemas changed, so drop their pooled connections
+            self._invalidate_pool(source_path)
+            self._invalidate_pool(target_path)
+            self._invalidate_statements(source_db, table_name)
+            self._invalidate_statements(target_db, table_name)
+            self._table_names.pop(source_db, None)
+            self._table_names.pop(target_db, None)
+            self._invalidate_count(source_db, table_name)
+            self._invalidate_count(target_db, table_name)
+            self._bump_generation(source_db)
+            self._bump_generation(target_db)
+            self._table_metrics.pop(source_db, None)
+            self._table_metrics.pop(target_db, None)
+            
+            # Log the change
+            self.log_change('MOVE_TABLE', source_db, table_name, {
+                'target_database': target_db,
+                'source_database': source_db
+            })
+            
+            return {
+                'success': True,
+                'message': f'Table {table_name} moved successfully from {source_db} to {target_db}'
+            }
+            
         except Exception as e:
             error_msg = f"Error moving table {table_name} from {source_db} to {target_db}: {e}"
             self.logger.error(error_msg)
             return {'success': False, 'error': error_msg}
     
-    def execute_custom_query(self, database_name: str, query: str) -> Dict[str, Any]:
+    def _fetch_dicts(self, cursor: sqlite3.Cursor) -> List[Dict[str, Any]]:
+        """
+        Materialize a cursor as dictionaries using fetchmany batches
+        
+        Rows are plain tuples zipped against column names read once from
+        the cursor, which is cheaper than building dicts from sqlite3.Row.
+        """
+        if cursor.description is None:
+            return []
+        
+        keys = tuple(description[0] for description in cursor.description)
+        cursor.arraysize = self.FETCH_BATCH_SIZE
+        data = []
+        while True:
+            batch = cursor.fetchmany()
+            if not batch:
+                break
+            data.extend(dict(zip(keys, row)) for row in batch)
+        return data
+    
+    def _stream_rows(self, db_path: Path, query: str):
+        """
+        Run a read-only query and yield its column names, then each row as a dict
+        
+        The pooled connection is held until the generator is exhausted or closed.
+        """
+        with self._checkout(db_path) as conn:
+            cursor = conn.execute(query)
+            cursor.arraysize = self.FETCH_BATCH_SIZE
+            
+            keys = [description[0] for description in cursor.description]
+            yield keys
+            
+            while True:
+                batch = cursor.fetchmany()
+                if not batch:
+                    break
+                yield from (dict(zip(keys, row)) for row in batch)
+    
+    @staticmethod
+    def _leading_keyword(query: str) -> str:
+        """
+        Return the first SQL keyword of a query in lowercase
+        
+        Skips whitespace and comments and only looks at the query prefix, so
+        no uppercased copy of the whole query is made.
+        """
+        i, n = 0, len(query)
+        while i < n:
+            ch = query[i]
+            if ch.isspace():
+                i += 1
+            elif query.startswith('--', i):
+                end = query.find('\n', i)
+                i = n if end == -1 else end + 1
+            elif query.startswith('/*', i):
+                end = query.find('*/', i + 2)
+                i = n if end == -1 else end + 2
+            else:
+                break
+        
+        start = i
+        while i < n and (query[i].isalnum() or query[i] == '_'):
+            i += 1
+        return query[start:i].lower()
+    
+    def execute_custom_query(self, database_name: str, query: str,
+                             stream: bool = False) -> Dict[str, Any]:
         """
         Execute a custom SQL query on any database
+        
+        With ``stream=True`` a plain SELECT returns a generator of row dicts in
+        ``data`` instead of a list, and ``row_count`` is None.
         """
         try:
             db_path = self.base_path / f"{database_name}.db"
@@ -458,20 +1418,51 @@ class DynamicDatabaseManager:
             if not db_path.exists():
                 return {'success': False, 'error': f'Database {database_name} not found'}
             
-            with sqlite3.connect(db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                
-                # Determine if it's a SELECT query or modification query
-                query_upper = query.upper().strip()
-                is_select = query_upper.startswith('SELECT') or query_upper.startswith('WITH')
-                
+            # Determine if it's a SELECT query or modification query
+            keyword = self._leading_keyword(query)
+            is_select = keyword in ('select', 'with', 'explain')
+            
+            # Plain SELECTs run on a pooled read-only connection. WITH may wrap a
+            # write, so it stays on the writer.
+            read_only = keyword in ('select', 'explain')
+            
+            if stream and read_only:
+                rows = self._stream_rows(db_path, query)
+                columns = next(rows)
+                return {
+                    'success': True,
+                    'query_type': 'SELECT',
+                    'data': rows,
+                    'row_count': None,
+                    'columns': columns
+                }
+            
+            # Serve repeated SELECTs from the result cache. WITH statements are
+            # never cached, as they may write
+            if read_only:
+                cache_key = self._query_cache_key(database_name, db_path, query)
+                with self._query_cache_lock:
+                    cached = self._query_cache.get(cache_key)
+                    if cached is not None:
+                        self._query_cache.move_to_end(cache_key)
+                if cached is not None:
+                    return {**cached, 'data': [dict(row) for row in cached['data']],
+                            'columns': list(cached['columns'])}
+            
+            with self._checkout(db_path, write=not read_only) as conn:
+                changes_before = conn.total_changes
                 cursor = conn.cursor()
                 cursor.execute(query)
                 
                 if is_select:
-                    rows = cursor.fetchall()
-                    data = [dict(row) for row in rows]
-                    columns = [description[0] for description in cursor.description] if rows else []
+                    data = self._fetch_dicts(cursor)
+                    columns = [description[0] for description in cursor.description] if data else []
+                    
+                    # A WITH wrapping an INSERT/UPDATE/DELETE is recorded like any other write
+                    affected_rows = conn.total_changes - changes_before
+                    if not read_only and affected_rows:
+                        conn.commit()
+                        self._record_custom_write(database_name, query, affected_rows)
                     
                     result = {
                         'success': True,
@@ -480,15 +1471,20 @@ class DynamicDatabaseManager:
                         'row_count': len(data),
                         'columns': columns
                     }
+                    
+                    # Rows are cached as item tuples, so callers never share
+                    # (or mutate) the cached copies
+                    if read_only and len(data) <= self.QUERY_CACHE_MAX_ROWS:
+                        cached_rows = tuple(tuple(row.items()) for row in data)
+                        with self._query_cache_lock:
+                            self._query_cache[cache_key] = {**result, 'data': cached_rows,
+                                                            'columns': tuple(columns)}
+                            if len(self._query_cache) > self.QUERY_CACHE_SIZE:
+                                self._query_cache.popitem(last=False)
                 else:
                     conn.commit()
                     affected_rows = cursor.rowcount
-                    
-                    # Log modification queries
-                    self.log_change('CUSTOM_QUERY', database_name, None, {
-                        'query': query,
-                        'affected_rows': affected_rows
-                    })
+                    self._record_custom_write(database_name, query, affected_rows)
                     
                     result = {
                         'success': True,
@@ -504,22 +1500,41 @@ class DynamicDatabaseManager:
             self.logger.error(error_msg)
             return {'success': False, 'error': error_msg, 'query': query}
     
+    def _record_custom_write(self, database_name: str, query: str, affected_rows: int):
+        """Drop cached state for a database after a custom query wrote to it, and log it"""
+        # Any table may have changed, so drop counts and keys for the whole database
+        self._invalidate_count(database_name)
+        self._invalidate_unique_keys(database_name)
+        self._bump_generation(database_name)
+        self._table_metrics.pop(database_name, None)
+        
+        # Log modification queries
+        self.log_change('CUSTOM_QUERY', database_name, None, {
+            'query': query,
+            'affected_rows': affected_rows
+        })
+    
     def refresh_all_database_info(self):
         """
         Refresh cached information for all databases
         """
-        self.schema_cache.clear()
-        self.metadata_cache.clear()
-        
         databases = self.get_all_databases()
         
-        for db_name, db_info in databases.items():
-            self.schema_cache[db_name] = db_info['tables']
-            self.metadata_cache[db_name] = {
-                'size': db_info['size'],
-                'modified': db_info['modified'],
-                'table_count': len(db_info['tables'])
-            }
+        with self._cache_lock:
+            self.schema_cache.clear()
+            self._unique_keys.clear()
+            self.metadata_cache.clear()
+            self._table_names.clear()
+            
+            for db_name, db_info in databases.items():
+                self.schema_cache[db_name] = db_info['tables']
+                self._table_names[db_name] = {t['name'] for t in db_info['tables']}
+                self.metadata_cache[db_name] = {
+                    'size': db_info['size'],
+                    'modified': db_info['modified'],
+                    'mtime_raw': db_info['mtime_raw'],
+                    'table_count': len(db_info['tables'])
+                }
         
         self.logger.info(f"Refreshed info for {len(databases)} databases")
     
@@ -527,10 +1542,14 @@ class DynamicDatabaseManager:
         """
         Get recent database changes for AI system updates
         """
-        changes = self.change_log
-        
-        if since:
-            # Filter changes since a specific timestamp
-            changes = [c for c in changes if c['timestamp'] >= since]
-        
-        return changes[-limit:] if limit else changes
\ No newline at end of file
+        with self._change_log_lock:
+            start = 0
+            
+            if since:
+                # Timestamps are appended in order, so bisect to the first change since
+                start = bisect.bisect_left(self._ts_index, since)
+            
+            if limit:
+                start = max(start, len(self.change_log) - limit)
+            
+            return self.change_log[start:]
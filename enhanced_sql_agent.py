@@ -7,12 +7,110 @@ from sql_agent import SQLAgent
 from multi_database_manager import MultiDatabaseManager
 from typing import Dict, List, Any, Optional
 import sqlite3
+import os
+import re
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Statements that mark a question as already-formed SQL
+_RAW_SQL_KEYWORDS = frozenset({'select', 'with', 'insert', 'update', 'delete', 'create', 'alter', 'drop'})
+
+# A word, read once leading whitespace and SQL comments have been skipped
+_WORD_PATTERN = re.compile(r'\w+')
+
+# Statement shapes that tell SQL apart from questions like "Select the top crops"
+_RAW_SQL_SHAPE_PATTERN = re.compile(
+    r'select\b.+\bfrom\b|with\s+\w+\s+as\s*\(|insert\s+into\b|update\s+\S+\s+set\b|delete\s+from\b|'
+    r'create\s+(?:unique\s+)?(?:table|index|view)\b|alter\s+table\b|drop\s+(?:table|index|view)\b',
+    re.IGNORECASE | re.DOTALL
+)
+
+
+def _skip_sql_preamble(text: str) -> int:
+    """Index of the first character after leading whitespace and SQL comments
+    
+    A plain scan rather than a regex, so the cost stays linear in the length
+    of the input whatever the user pastes.
+    """
+    pos, length = 0, len(text)
+    while pos < length:
+        if text[pos].isspace():
+            pos += 1
+        elif text.startswith('--', pos):
+            newline = text.find('\n', pos)
+            pos = length if newline == -1 else newline + 1
+        elif text.startswith('/*', pos):
+            end = text.find('*/', pos + 2)
+            if end == -1:
+                # An unterminated comment is not skipped
+                return pos
+            pos = end + 2
+        else:
+            break
+    return pos
+
+
+def _db_file_stamp(db_path) -> tuple:
+    """Modification time and size of a database file and its WAL"""
+    stamp = []
+    for path in (db_path, f"{db_path}-wal"):
+        try:
+            st = os.stat(path)
+            stamp.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            stamp.append(None)
+    return tuple(stamp)
+
+
+# Keywords that point a question at each known database
+_DB_KEYWORDS = {
+    'earthquake': frozenset({'earthquake', 'seismic', 'magnitude', 'tsunami', 'geological', 'tremor', 'quake', 'disaster', 'natural disaster', 'richter'}),
+    'Crop_recommendation': frozenset({'crop', 'crops', 'farming', 'agriculture', 'recommendation', 'plant', 'grow', 'harvest', 'soil', 'fertilizer', 'irrigation', 'seeds', 'yield', 'rice', 'wheat', 'corn', 'barley'}),
+    'Customer_Churn_prediction': frozenset({'customer', 'churn', 'retention', 'prediction', 'subscription', 'cancel', 'loyalty', 'attrition', 'clients', 'users', 'subscribers'}),
+    'Cardict_Arrest': frozenset({'cardiac', 'heart', 'arrest', 'cardiovascular', 'medical', 'cardiact', 'cardict', 'heart attack', 'coronary', 'arrhythmia', 'cardiology', 'ecg', 'ekg'}),
+    'main': frozenset({
+        # PCOS related
+        'pcos', 'patient', 'health', 'syndrome', 'ovarian', 'hormone', 'polycystic', 'infertility',
+        # Sales and business related
+        'sales', 'revenue', 'profit', 'orders', 'products', 'company', 'business', 'offers',
+        # Employee related
+        'employees', 'staff', 'workers', 'human resources', 'hr'
+    }),
+}
+
+
+@lru_cache(maxsize=64)
+def _db_context_string(database_names: tuple) -> str:
+    """Question prefix naming the databases of a multi-database query"""
+    return f"Available databases: {', '.join(database_names)}. "
+
 
 class EnhancedSQLAgent(SQLAgent):
     """Enhanced SQL Agent with multi-database and table selection support"""
     
+    # Attributes of this class live in slots. SQLAgent has no __slots__, so
+    # inherited attributes (and instance-level overrides) still use __dict__.
+    __slots__ = (
+        'multi_db_manager', 'current_databases', 'current_tables',
+        '_schema_info', '_schema_dirty', '_ctx_snapshot', '_attached_databases',
+        '_available_db_names', '_active_keyword_map', '_keyword_ac', '_keyword_hs', '_kw_by_firstchar',
+        '_db_info_cache', '_combined_schema_cache', '_exists_cache',
+        '_last_loaded_db_path', '_last_loaded_stamp', '_last_loaded_schema',
+    )
+    
     def __init__(self, db_manager_or_path=None):
         """Initialize the Enhanced SQL Agent
         
@@ -38,14 +136,212 @@ class EnhancedSQLAgent(SQLAgent):
         # Initialize parent SQL Agent
         super().__init__(db_path)
         
-        # Track current database context
-        self.current_databases = ['main']
-        self.current_tables = []
+        # Track current database context; tuples, so snapshots can share them
+        self.current_databases = ('main',)
+        self.current_tables = ()
+        
+        # name -> path of databases attached to every query connection (multi-database queries)
+        self._attached_databases: Dict[str, str] = {}
+        
+        # Original values of context fields changed inside _context_scope()
+        self._ctx_snapshot: Optional[Dict[str, Any]] = None
+        
+        # Keywords of the available databases, and their automaton (built on first use)
+        self._refresh_keyword_map()
+        
+        # database_name -> get_database_info() result, filled on first use
+        self._db_info_cache: Optional[Dict[str, Dict[str, Any]]] = None
+        
+        # tuple of database names -> combined schema for multi-database queries
+        self._combined_schema_cache: Dict[tuple, str] = {}
+        
+        # database path -> whether the file exists, until the next refresh or upload
+        self._exists_cache: Dict[str, bool] = {}
+        
+        # Most recently loaded single-database schema, reused when switching back
+        # to it while the file is unchanged
+        self._last_loaded_db_path: Optional[Path] = None
+        self._last_loaded_stamp: Optional[tuple] = None
+        self._last_loaded_schema: Optional[str] = None
+    
+    @property
+    def schema_info(self) -> str:
+        """Schema of the current database, loaded on first read after a context switch"""
+        if self._schema_dirty:
+            if self._schema_stale():
+                self._last_loaded_stamp = _db_file_stamp(self.db_path)
+                self._last_loaded_schema = self._get_database_schema()
+                self._last_loaded_db_path = self.db_path
+            self._schema_info = self._last_loaded_schema
+            self._schema_dirty = False
+        return self._schema_info
+    
+    @schema_info.setter
+    def schema_info(self, value: str):
+        self._schema_info = value
+        self._schema_dirty = False
+    
+    def _schema_stale(self) -> bool:
+        """Whether the current database differs from, or changed since, the last loaded schema"""
+        return (self._last_loaded_db_path != self.db_path
+                or self._last_loaded_stamp != _db_file_stamp(self.db_path))
+    
+    @contextmanager
+    def _context_scope(self):
+        """Restore any database/table context changed inside the block on exit"""
+        outer_snapshot = self._ctx_snapshot
+        self._ctx_snapshot = {}
+        try:
+            yield
+        finally:
+            for name, value in self._ctx_snapshot.items():
+                if name == 'schema':
+                    self._schema_info, self._schema_dirty = value
+                else:
+                    setattr(self, name, value)
+            self._ctx_snapshot = outer_snapshot
+    
+    def _stash_context(self, *names: str):
+        """Remember the current value of context fields before they are changed
+        
+        Only the first change of a field inside a _context_scope() is recorded.
+        """
+        if self._ctx_snapshot is None:
+            return
+        
+        for name in names:
+            if name not in self._ctx_snapshot:
+                if name == 'schema':
+                    self._ctx_snapshot[name] = (self._schema_info, self._schema_dirty)
+                else:
+                    self._ctx_snapshot[name] = getattr(self, name)
+    
+    def _get_connection(self) -> sqlite3.Connection:
+        """Open a query connection with any multi-database context attached
+        
+        Each attached database is reachable as ``<database name>.<table>``,
+        matching the combined multi-database schema.
+        """
+        conn = super()._get_connection()
+        try:
+            for db_name, db_path in self._attached_databases.items():
+                quoted_name = '"' + db_name.replace('"', '""') + '"'
+                conn.execute(f"ATTACH DATABASE ? AS {quoted_name}", (db_path,))
+        except Exception:
+            conn.close()
+            raise
+        return conn
+    
+    def _database_exists(self, db_path: Optional[str]) -> bool:
+        """Check whether a database file exists, remembering the answer per path
+        
+        Args:
+            db_path: Database file path, or None
+            
+        Returns:
+            True if the file exists
+        """
+        if not db_path:
+            return False
+        
+        exists = self._exists_cache.get(db_path)
+        if exists is None:
+            exists = self._exists_cache[db_path] = Path(db_path).exists()
+        return exists
     
     def refresh_all_schemas(self):
         """Refresh schema information for all databases"""
         self.multi_db_manager.refresh_database_info()
         self.refresh_schema()
+        self._reset_caches()
+    
+    def _reset_caches(self):
+        """Drop everything cached about the set of databases and their schemas"""
+        self._refresh_keyword_map()
+        self._db_info_cache = None
+        self._combined_schema_cache.clear()
+        self._exists_cache.clear()
+        self._last_loaded_db_path = None
+        self._last_loaded_stamp = None
+        self._last_loaded_schema = None
+    
+    def _refresh_keyword_map(self):
+        """Recompute the detection keywords for the databases that are available"""
+        available_dbs = self.multi_db_manager.get_databases()
+        self._available_db_names = tuple(available_dbs)
+        self._active_keyword_map = {db_name: keywords for db_name, keywords in _DB_KEYWORDS.items()
+                                    if db_name in available_dbs}
+        self._keyword_ac = None
+        self._keyword_hs = None
+        
+        # First character -> [(keyword, database)], shortest keywords first
+        self._kw_by_firstchar = {}
+        for db_name, keywords in self._active_keyword_map.items():
+            for keyword in keywords:
+                self._kw_by_firstchar.setdefault(keyword[0], []).append((keyword, db_name))
+        for entries in self._kw_by_firstchar.values():
+            entries.sort(key=lambda entry: len(entry[0]))
+    
+    def _get_keyword_automaton(self):
+        """Get the Aho-Corasick automaton over all active database keywords
+        
+        Returns:
+            Automaton whose values are database names, or None if there are no keywords
+        """
+        if self._keyword_ac is None and self._active_keyword_map:
+            automaton = ahocorasick.Automaton()
+            for db_name, keywords in self._active_keyword_map.items():
+                for keyword in keywords:
+                    automaton.add_word(keyword, db_name)
+            automaton.make_automaton()
+            self._keyword_ac = automaton
+        
+        return self._keyword_ac
+    
+    def _get_keyword_hyperscan_db(self):
+        """Get the Hyperscan database over all active database keywords
+        
+        Pattern ids are positions in the active keyword map, so each match
+        maps straight back to its database.
+        
+        Returns:
+            Compiled Hyperscan database, or None if there are no keywords
+        """
+        if self._keyword_hs is None and self._active_keyword_map:
+            expressions, ids = [], []
+            for db_id, keywords in enumerate(self._active_keyword_map.values()):
+                for keyword in keywords:
+                    expressions.append(re.escape(keyword).encode())
+                    ids.append(db_id)
+            
+            hs_db = hyperscan.Database()
+            hs_db.compile(
+                expressions=expressions,
+                ids=ids,
+                elements=len(expressions),
+                flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(expressions)
+            )
+            self._keyword_hs = hs_db
+        
+        return self._keyword_hs
+    
+    def _looks_like_raw_sql(self, question: str) -> bool:
+        """Check whether a question is already a SQL statement
+        
+        The first word is checked before the statement shape, so ordinary
+        questions are rejected without scanning their full text.
+        
+        Args:
+            question: Natural language question or SQL statement
+            
+        Returns:
+            True if the question is SQL rather than natural language
+        """
+        match = _WORD_PATTERN.match(question, _skip_sql_preamble(question))
+        if not match or match.group().lower() not in _RAW_SQL_KEYWORDS:
+            return False
+        
+        return bool(_RAW_SQL_SHAPE_PATTERN.match(question, match.start()))
     
     def auto_detect_databases(self, question: str) -> List[str]:
         """Automatically detect which databases to query based on keywords in the question
@@ -56,44 +352,39 @@ class EnhancedSQLAgent(SQLAgent):
         Returns:
             List of database names that likely contain relevant data
         """
-        question_lower = question.lower()
-        detected_databases = []
-        
-        # Get available databases dynamically
-        available_dbs = self.multi_db_manager.get_databases()
-        
-        # Keyword patterns for database detection
-        database_keywords = {}
+        # With a single database there is nothing to choose between
+        if len(self._available_db_names) <= 1:
+            return list(self._available_db_names) or ['main']
         
-        # Add keywords for each available database based on actual content and names
-        if 'earthquake' in available_dbs:
-            database_keywords['earthquake'] = ['earthquake', 'seismic', 'magnitude', 'tsunami', 'geological', 'tremor', 'quake', 'disaster', 'natural disaster', 'richter']
-        
-        if 'Crop_recommendation' in available_dbs:
-            database_keywords['Crop_recommendation'] = ['crop', 'crops', 'farming', 'agriculture', 'recommendation', 'plant', 'grow', 'harvest', 'soil', 'fertilizer', 'irrigation', 'seeds', 'yield', 'rice', 'wheat', 'corn', 'barley']
-        
-        if 'Customer_Churn_prediction' in available_dbs:
-            database_keywords['Customer_Churn_prediction'] = ['customer', 'churn', 'retention', 'prediction', 'subscription', 'cancel', 'loyalty', 'attrition', 'clients', 'users', 'subscribers']
-        
-        if 'Cardict_Arrest' in available_dbs:
-            database_keywords['Cardict_Arrest'] = ['cardiac', 'heart', 'arrest', 'cardiovascular', 'medical', 'cardiact', 'cardict', 'heart attack', 'coronary', 'arrhythmia', 'cardiology', 'ecg', 'ekg']
+        question_lower = question.lower()
         
-        if 'main' in available_dbs:
-            database_keywords['main'] = [
-                # PCOS related
-                'pcos', 'patient', 'health', 'syndrome', 'ovarian', 'hormone', 'polycystic', 'infertility',
-                # Sales and business related
-                'sales', 'revenue', 'profit', 'orders', 'products', 'company', 'business', 'offers',
-                # Employee related
-                'employees', 'staff', 'workers', 'human resources', 'hr'
-            ]
+        if HYPERSCAN_AVAILABLE:
+            # One compiled multi-pattern scan over the question
+            hs_db = self._get_keyword_hyperscan_db()
+            matched_ids = set()
+            if hs_db is not None:
+                hs_db.scan(question_lower.encode(),
+                           match_event_handler=lambda db_id, start, end, flags, context: matched_ids.add(db_id))
+            db_names = list(self._active_keyword_map)
+            matched = {db_names[db_id] for db_id in matched_ids}
+        elif AHOCORASICK_AVAILABLE:
+            # One pass over the question finds every keyword of every database
+            automaton = self._get_keyword_automaton()
+            matched = {db_name for _, db_name in automaton.iter(question_lower)} if automaton else set()
+        else:
+            # Only keywords starting with a character of the question, and no
+            # longer than it, can possibly match
+            question_length = len(question_lower)
+            matched = set()
+            for char in set(question_lower):
+                for keyword, db_name in self._kw_by_firstchar.get(char, ()):
+                    if len(keyword) > question_length:
+                        break
+                    if db_name not in matched and keyword in question_lower:
+                        matched.add(db_name)
         
-        # Check for keyword matches
-        for db_name, keywords in database_keywords.items():
-            if any(keyword in question_lower for keyword in keywords):
-                # Verify database exists
-                if db_name in available_dbs:
-                    detected_databases.append(db_name)
+        # Keep the keyword table's order, since the first database runs multi-database queries
+        detected_databases = [db_name for db_name in self._active_keyword_map if db_name in matched]
         
         # If no specific database detected, return main as default
         if not detected_databases:
@@ -111,18 +402,21 @@ class EnhancedSQLAgent(SQLAgent):
         available_dbs = self.multi_db_manager.get_databases()
         valid_db_names = [db for db in database_names if db in available_dbs]
         
+        self._stash_context('current_databases')
+        
         if valid_db_names:
-            self.current_databases = valid_db_names
+            self.current_databases = tuple(valid_db_names)
             
             # If only one database, update the agent's primary database
             if len(valid_db_names) == 1:
                 db_path = self.multi_db_manager.get_database_path(valid_db_names[0])
-                if db_path and Path(db_path).exists():
+                if self._database_exists(db_path) and (self.db_path != Path(db_path) or self._schema_stale()):
+                    self._stash_context('db_path', 'schema')
                     self.db_path = Path(db_path)
-                    self.refresh_schema()
+                    self._schema_dirty = True
         else:
             # Fallback to main database
-            self.current_databases = ['main']
+            self.current_databases = ('main',)
     
     def set_table_context(self, table_names: List[str]):
         """Set the current table context for queries
@@ -130,22 +424,28 @@ class EnhancedSQLAgent(SQLAgent):
         Args:
             table_names: List of table names to focus on
         """
-        self.current_tables = table_names
+        self._stash_context('current_tables')
+        self.current_tables = tuple(table_names)
     
     def get_available_databases(self) -> Dict[str, Dict[str, Any]]:
         """Get information about all available databases
         
+        The information is cached until the next schema refresh or upload.
+        
         Returns:
             Dictionary with database information
         """
-        databases_info = {}
-        databases = self.multi_db_manager.get_databases()
-        
-        for db_name in databases:
-            info = self.multi_db_manager.get_database_info(db_name)
-            databases_info[db_name] = info
+        if self._db_info_cache is None:
+            databases_info = {}
+            databases = self.multi_db_manager.get_databases()
+            
+            for db_name in databases:
+                info = self.multi_db_manager.get_database_info(db_name)
+                databases_info[db_name] = info
+            
+            self._db_info_cache = databases_info
         
-        return databases_info
+        return dict(self._db_info_cache)
     
     def get_available_tables(self, database_name: Optional[str] = None) -> List[str]:
         """Get available tables from a specific database or all databases
@@ -157,18 +457,13 @@ class EnhancedSQLAgent(SQLAgent):
             List of table names
         """
         if database_name:
-            if database_name in self.multi_db_manager.get_databases():
-                db_info = self.multi_db_manager.get_database_info(database_name)
-                return db_info.get('tables', [])
-            return []
+            # Unknown databases have no entry; failed lookups carry only an error
+            db_info = self.get_available_databases().get(database_name) or {}
+            return db_info.get('tables', [])
         else:
-            # Get tables from all databases
-            all_tables = self.multi_db_manager.get_all_tables_across_databases()
-            tables = []
-            for db_name, db_tables in all_tables.items():
-                # Add database prefix to table names for clarity
-                tables.extend([f"{db_name}.{table}" for table in db_tables])
-            return tables
+            # Get tables from all databases, with a database prefix for clarity
+            all_tables = self.get_tables_by_database()
+            return [f"{db_name}.{table}" for db_name, db_tables in all_tables.items() for table in db_tables]
     
     def get_tables_by_database(self) -> Dict[str, List[str]]:
         """Get tables organized by database
@@ -176,7 +471,26 @@ class EnhancedSQLAgent(SQLAgent):
         Returns:
             Dictionary of database_name -> list of tables
         """
-        return self.multi_db_manager.get_all_tables_across_databases()
+        return {db_name: info.get('tables', []) for db_name, info in self.get_available_databases().items()}
+    
+    def _error_result(self, error: Any, stage: str = "Error executing query",
+                      explanation: Optional[str] = None) -> Dict[str, Any]:
+        """Build the result dictionary returned when a query cannot be answered
+        
+        Args:
+            error: Exception or error message
+            stage: Prefix for the default explanation
+            explanation: Explanation to use instead of the default one
+            
+        Returns:
+            Failed query results dictionary
+        """
+        return {
+            "success": False,
+            "error": str(error),
+            "sql_query": "",
+            "explanation": explanation or f"{stage}: {error}"
+        }
     
     def query_enhanced(self, question: str, selected_databases: Optional[List[str]] = None, 
                       selected_tables: Optional[List[str]] = None) -> Dict[str, Any]:
@@ -190,90 +504,66 @@ class EnhancedSQLAgent(SQLAgent):
         Returns:
             Query results dictionary
         """
-        # Store original context
-        original_databases = self.current_databases.copy()
-        original_tables = self.current_tables.copy()
-        original_db_path = self.db_path
-        original_schema = self.schema_info
-        
-        try:
-            # Set context if provided, otherwise auto-detect
-            if selected_databases:
-                self.set_database_context(selected_databases)
-            else:
-                # Auto-detect databases based on question keywords
-                auto_detected = self.auto_detect_databases(question)
-                self.set_database_context(auto_detected)
-            
-            if selected_tables:
-                self.set_table_context(selected_tables)
-            
-            # Store the query result
-            query_result = None
-            
-            # Handle multi-database queries
-            if len(self.current_databases) > 1:
-                query_result = self._query_multi_database(question, self.current_databases, selected_tables)
-            
-            # Single database query
-            elif len(self.current_databases) == 1:
-                # Set the database context
-                db_name = self.current_databases[0]
-                db_path = self.multi_db_manager.get_database_path(db_name)
+        # Any context changed while answering is restored afterwards
+        with self._context_scope():
+            try:
+                # Set context if provided, otherwise auto-detect
+                if selected_databases:
+                    self.set_database_context(selected_databases)
+                elif self._looks_like_raw_sql(question):
+                    # Raw SQL carries no topic keywords, so go straight to the default database
+                    self.set_database_context(['main'])
+                else:
+                    # Auto-detect databases based on question keywords
+                    auto_detected = self.auto_detect_databases(question)
+                    self.set_database_context(auto_detected)
                 
-                if db_path and Path(db_path).exists():
-                    self.db_path = Path(db_path)
-                    self.refresh_schema()
-                    
-                    # Add database context to query result
-                    context_info = f"Using database: {db_name} ({db_path})"
+                if selected_tables:
+                    self.set_table_context(selected_tables)
+                
+                # Handle multi-database queries
+                if len(self.current_databases) > 1:
+                    return self._query_multi_database(question, self.current_databases, selected_tables)
+                
+                # Single database query
+                elif len(self.current_databases) == 1:
+                    # Set the database context
+                    db_name = self.current_databases[0]
+                    db_path = self.multi_db_manager.get_database_path(db_name)
                     
-                    # Use table filtering if tables are selected
-                    if self.current_tables:
-                        query_result = self.query_with_table_filter(question, self.current_tables)
-                    else:
-                        query_result = self.query(question)
+                    if self._database_exists(db_path):
+                        if self.db_path != Path(db_path) or self._schema_stale():
+                            self._stash_context('db_path', 'schema')
+                            self.db_path = Path(db_path)
+                            self._schema_dirty = True
                         
-                    # Add context information to the result
-                    if query_result and isinstance(query_result, dict):
-                        query_result['database_used'] = db_name
-                        query_result['database_path'] = db_path
-                        if 'explanation' in query_result:
-                            query_result['explanation'] = f"{context_info}\n\n{query_result['explanation']}"
-                else:
-                    query_result = {
-                        "success": False,
-                        "error": f"Database '{db_name}' not found or inaccessible",
-                        "sql_query": "",
-                        "explanation": f"The specified database '{db_name}' could not be accessed."
-                    }
-            
-            else:
-                # No database context, use default
-                query_result = self.query(question)
-            
-            # Restore original context AFTER query execution
-            self.current_databases = original_databases
-            self.current_tables = original_tables
-            self.db_path = original_db_path
-            self.schema_info = original_schema
-            
-            # Return the result
-            return query_result
+                        # Add database context to query result
+                        context_info = f"Using database: {db_name} ({db_path})"
+                        
+                        # Use table filtering if tables are selected
+                        if self.current_tables:
+                            query_result = self.query_with_table_filter(question, self.current_tables)
+                        else:
+                            query_result = self.query(question)
+                            
+                        # Add context information to the result
+                        if query_result and isinstance(query_result, dict):
+                            query_result['database_used'] = db_name
+                            query_result['database_path'] = db_path
+                            if 'explanation' in query_result:
+                                query_result['explanation'] = "\n\n".join((context_info, query_result['explanation']))
+                        
+                        return query_result
+                    
+                    return self._error_result(f"Database '{db_name}' not found or inaccessible",
+                                              explanation=f"The specified database '{db_name}' could not be accessed.")
                 
-        except Exception as e:
-            # Restore original context in case of exception
-            self.current_databases = original_databases
-            self.current_tables = original_tables
-            self.db_path = original_db_path
-            self.schema_info = original_schema
-            
-            return {
-                "success": False,
-                "error": str(e),
-                "sql_query": "",
-                "explanation": f"Error executing query: {str(e)}"
-            }
+                else:
+                    # No database context, use default
+                    return self.query(question)
+                    
+            except Exception as e:
+                return self._error_result(e, "Error executing query")
     
     def _query_multi_database(self, question: str, database_names: List[str], 
                             selected_tables: Optional[List[str]] = None) -> Dict[str, Any]:
@@ -287,47 +577,48 @@ class EnhancedSQLAgent(SQLAgent):
         Returns:
             Query results dictionary
         """
-        try:
-            # Get combined schema for selected databases
+        # Get combined schema for selected databases, reusing it until the next refresh
+        schema_key = tuple(database_names)
+        combined_schema = self._combined_schema_cache.get(schema_key)
+        if combined_schema is None:
             combined_schema = self.multi_db_manager.get_schema_for_databases(database_names)
-            
-            # Temporarily replace schema
-            original_schema = self.schema_info
+            self._combined_schema_cache[schema_key] = combined_schema
+        
+        # Add multi-database context to the question
+        db_context = _db_context_string(tuple(sorted(database_names)))
+        if selected_tables:
+            table_context = f"Focus on these tables: {', '.join(selected_tables)}. "
+        else:
+            table_context = ""
+        
+        enhanced_question = f"{db_context}{table_context}{question}"
+        
+        # Run on one connection to the primary database with the others
+        # attached, so the generated SQL can join across databases. The
+        # "main" database already answers to its name as the primary.
+        primary_db = 'main' if 'main' in database_names else database_names[0]
+        primary_path = self.multi_db_manager.get_database_path(primary_db)
+        if not self._database_exists(primary_path):
+            return self._error_result(f"Database '{primary_db}' not found or inaccessible",
+                                      "Error executing multi-database query")
+        
+        attached = {}
+        for db_name in database_names:
+            db_path = self.multi_db_manager.get_database_path(db_name)
+            if db_name != 'main' and self._database_exists(db_path):
+                attached[db_name] = db_path
+        
+        # Temporarily replace schema and connection target
+        with self._context_scope():
+            self._stash_context('schema', 'db_path', '_attached_databases')
+            self.db_path = Path(primary_path)
+            self._attached_databases = attached
             self.schema_info = combined_schema
             
-            # Add multi-database context to the question
-            db_context = f"Available databases: {', '.join(database_names)}. "
-            if selected_tables:
-                table_context = f"Focus on these tables: {', '.join(selected_tables)}. "
-            else:
-                table_context = ""
-            
-            enhanced_question = f"{db_context}{table_context}{question}"
-            
-            # Note: For true multi-database queries, you might need to implement
-            # database attachment or federation. For now, we'll use the first database
-            # and inform the user about the limitation
-            
-            result = self.query(enhanced_question)
-            
-            # Add multi-database context to explanation
-            if result.get("success"):
-                result["explanation"] += f"\n\nNote: This query was executed against the '{database_names[0]}' database. " \
-                                       f"For queries across multiple databases ({', '.join(database_names)}), " \
-                                       f"consider using ATTACH DATABASE statements in custom SQL."
-            
-            # Restore schema
-            self.schema_info = original_schema
-            
-            return result
-            
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "sql_query": "",
-                "explanation": f"Error executing multi-database query: {str(e)}"
-            }
+            try:
+                return self.query(enhanced_question)
+            except Exception as e:
+                return self._error_result(e, "Error executing multi-database query")
     
     def add_database_from_upload(self, name: str, upload_results: List[Dict]) -> bool:
         """Add a new database from file upload results
@@ -345,6 +636,7 @@ class EnhancedSQLAgent(SQLAgent):
             
             # Refresh manager info
             self.multi_db_manager.refresh_database_info()
+            self._reset_caches()
             
             return True
         except Exception as e:
@@ -375,8 +667,8 @@ class EnhancedSQLAgent(SQLAgent):
             "total_records": total_records,
             "databases": databases_info,
             "current_context": {
-                "databases": self.current_databases,
-                "tables": self.current_tables
+                "databases": list(self.current_databases),
+                "tables": list(self.current_tables)
             }
         }
     
@@ -4,45 +4,105 @@ Manages connections to external SQL databases (PostgreSQL, MySQL, SQL Server, Su
 """
 
 import json
+import os
+import re
+import hashlib
+import importlib.util
+import heapq
+import sys
 import sqlite3
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 import logging
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import attrgetter
 import urllib.parse
+import threading
+import time
 from datetime import datetime
 
 try:
-    import sqlalchemy
-    from sqlalchemy import create_engine, text, MetaData, inspect
-    from sqlalchemy.exc import SQLAlchemyError
-    SQLALCHEMY_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    SQLALCHEMY_AVAILABLE = False
+    ORJSON_AVAILABLE = False
 
 try:
-    import psycopg2
-    PSYCOPG2_AVAILABLE = True
+    import msgspec
+    MSGSPEC_AVAILABLE = True
 except ImportError:
-    PSYCOPG2_AVAILABLE = False
+    MSGSPEC_AVAILABLE = False
 
 try:
-    import pymysql
-    PYMYSQL_AVAILABLE = True
+    import sqlalchemy
+    from sqlalchemy import create_engine, text, MetaData, inspect, select, bindparam, literal_column
+    from sqlalchemy.exc import SQLAlchemyError
+    SQLALCHEMY_AVAILABLE = True
 except ImportError:
-    PYMYSQL_AVAILABLE = False
+    SQLALCHEMY_AVAILABLE = False
 
-try:
-    import pyodbc
-    PYODBC_AVAILABLE = True
-except ImportError:
-    PYODBC_AVAILABLE = False
+@lru_cache(maxsize=None)
+def _driver_available(module_name: str) -> bool:
+    """Check whether a database driver is installed without importing it
+    
+    SQLAlchemy imports the driver itself the first time an engine for that
+    database type connects, so unused drivers are never loaded.
+    """
+    return importlib.util.find_spec(module_name) is not None
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@dataclass
+# SQLAlchemy engines shared by every manager in the process, keyed by connection string
+_ENGINE_CACHE: Dict[str, Any] = {}
+_ENGINE_CACHE_LOCK = threading.Lock()
+
+# Connection strings that passed a live test recently, keyed by a hash of the
+# string (it embeds the password) -> (monotonic test time, last_tested value)
+_KNOWN_GOOD: Dict[str, Tuple[float, str]] = {}
+KNOWN_GOOD_TTL = 300  # seconds
+
+# Formatted local timestamp for the current second, reused by _now_iso
+_now_iso_cache = (None, None)
+
+def _now_iso() -> str:
+    """Current local time as an ISO string, formatted at most once per second"""
+    global _now_iso_cache
+    second = int(time.time())
+    cached_second, cached_value = _now_iso_cache
+    if cached_second != second:
+        cached_value = datetime.fromtimestamp(second).isoformat(timespec='seconds')
+        _now_iso_cache = (second, cached_value)
+    return cached_value
+
+# Matches queries whose first token is SELECT without copying the query text
+SELECT_PATTERN = re.compile(r'\s*SELECT', re.IGNORECASE)
+
+_SQLSERVER_DRIVER = "driver=ODBC+Driver+17+for+SQL+Server"
+
+def _sqlserver_url(c: 'DatabaseConnection') -> str:
+    # For SQL Server with Windows Authentication, username can be empty
+    if c.username:
+        return f"mssql+pyodbc://{c.username}:{urllib.parse.quote_plus(c.password)}@{c.host}:{c.port}/{c.database}?{_SQLSERVER_DRIVER}"
+    return f"mssql+pyodbc://{c.host}:{c.port}/{c.database}?{_SQLSERVER_DRIVER}&trusted_connection=yes"
+
+# Connection string builders keyed by db_type
+_CONN_TEMPLATES = {
+    # Support for Supabase and other PostgreSQL hosts
+    'postgresql': lambda c: f"postgresql+psycopg2://{c.username}:{urllib.parse.quote_plus(c.password)}@{c.host}:{c.port}/{c.database}",
+    'mysql': lambda c: f"mysql+pymysql://{c.username}:{urllib.parse.quote_plus(c.password)}@{c.host}:{c.port}/{c.database}",
+    'sqlserver': _sqlserver_url,
+    'sqlite': lambda c: f"sqlite:///{c.database}",
+}
+
+# Slotted dataclasses need Python 3.10+; older interpreters keep a per-instance __dict__
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_DATACLASS_OPTIONS)
 class DatabaseConnection:
     """Represents an external database connection configuration"""
     name: str
@@ -54,23 +114,52 @@ class DatabaseConnection:
     password: str
     connection_string: Optional[str] = None
     is_active: bool = True
-    created_at: str = None
-    last_tested: str = None
+    created_at: Optional[str] = None
+    last_tested: Optional[str] = None
     test_status: str = "not_tested"  # 'success', 'failed', 'not_tested'
+    pool_size: int = 5  # Warm connections kept per engine (server databases)
+    max_overflow: int = 10  # Extra connections allowed under load
+    _cached_conn_str: Optional[str] = field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         if self.created_at is None:
-            self.created_at = datetime.now().isoformat()
+            self.created_at = _now_iso()
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
-        return asdict(self)
+        # All fields are flat values, so skip asdict()'s recursive deepcopy
+        return {
+            'name': self.name,
+            'db_type': self.db_type,
+            'host': self.host,
+            'port': self.port,
+            'database': self.database,
+            'username': self.username,
+            'password': self.password,
+            'connection_string': self.connection_string,
+            'is_active': self.is_active,
+            'created_at': self.created_at,
+            'last_tested': self.last_tested,
+            'test_status': self.test_status,
+            'pool_size': self.pool_size,
+            'max_overflow': self.max_overflow
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'DatabaseConnection':
         """Create from dictionary"""
         return cls(**data)
 
+# Decodes saved connection records straight into DatabaseConnection objects;
+# strict=False keeps accepting values like ports saved as strings
+_CONNECTION_DECODER = (
+    msgspec.json.Decoder(DatabaseConnection, strict=False)
+    if MSGSPEC_AVAILABLE else None
+)
+
+# Marks a removed connection in the connections log
+TOMBSTONE_KEY = "_deleted"
+
 class ExternalDatabaseManager:
     """Manages external database connections and operations"""
     
@@ -78,6 +167,12 @@ class ExternalDatabaseManager:
         self.config_path = Path(config_path)
         self.connections: Dict[str, DatabaseConnection] = {}
         self.engines: Dict[str, Any] = {}  # SQLAlchemy engines cache
+        self._inspectors: Dict[str, Any] = {}  # SQLAlchemy inspectors by connection
+        self._log_records = 0  # Records in the connections file, live or superseded
+        
+        # Summary counters, kept up to date as connections are added and removed
+        self._active_count = 0
+        self._by_type: Counter = Counter()
         
         # Ensure config directory exists
         self.config_path.parent.mkdir(exist_ok=True)
@@ -91,7 +186,7 @@ class ExternalDatabaseManager:
             'postgresql': {
                 'name': 'PostgreSQL',
                 'default_port': 5432,
-                'available': PSYCOPG2_AVAILABLE and SQLALCHEMY_AVAILABLE,
+                'available': _driver_available('psycopg2') and SQLALCHEMY_AVAILABLE,
                 'driver': 'psycopg2',
                 'example_host': 'localhost or your-server.com',
                 'notes': 'Supports Supabase, AWS RDS, Google Cloud SQL'
@@ -99,7 +194,7 @@ class ExternalDatabaseManager:
             'mysql': {
                 'name': 'MySQL',
                 'default_port': 3306,
-                'available': PYMYSQL_AVAILABLE and SQLALCHEMY_AVAILABLE,
+                'available': _driver_available('pymysql') and SQLALCHEMY_AVAILABLE,
                 'driver': 'pymysql',
                 'example_host': 'localhost or your-server.com',
                 'notes': 'Supports AWS RDS, Google Cloud SQL, PlanetScale'
@@ -107,7 +202,7 @@ class ExternalDatabaseManager:
             'sqlserver': {
                 'name': 'SQL Server',
                 'default_port': 1433,
-                'available': PYODBC_AVAILABLE and SQLALCHEMY_AVAILABLE,
+                'available': _driver_available('pyodbc') and SQLALCHEMY_AVAILABLE,
                 'driver': 'pyodbc',
                 'example_host': 'localhost or your-server.com',
                 'notes': 'Supports Azure SQL Database, SQL Server Express'
@@ -131,13 +226,13 @@ class ExternalDatabaseManager:
         if not SQLALCHEMY_AVAILABLE:
             missing.append("sqlalchemy")
         
-        if not PSYCOPG2_AVAILABLE:
+        if not _driver_available('psycopg2'):
             missing.append("psycopg2-binary")
         
-        if not PYMYSQL_AVAILABLE:
+        if not _driver_available('pymysql'):
             missing.append("pymysql")
         
-        if not PYODBC_AVAILABLE:
+        if not _driver_available('pyodbc'):
             missing.append("pyodbc")
         
         return missing
@@ -147,43 +242,49 @@ class ExternalDatabaseManager:
         if connection.connection_string:
             return connection.connection_string
         
-        if connection.db_type == 'postgresql':
-            # Support for Supabase and other PostgreSQL hosts
-            return f"postgresql+psycopg2://{connection.username}:{urllib.parse.quote_plus(connection.password)}@{connection.host}:{connection.port}/{connection.database}"
-        
-        elif connection.db_type == 'mysql':
-            return f"mysql+pymysql://{connection.username}:{urllib.parse.quote_plus(connection.password)}@{connection.host}:{connection.port}/{connection.database}"
-        
-        elif connection.db_type == 'sqlserver':
-            # For SQL Server with Windows Authentication, username can be empty
-            if connection.username:
-                return f"mssql+pyodbc://{connection.username}:{urllib.parse.quote_plus(connection.password)}@{connection.host}:{connection.port}/{connection.database}?driver=ODBC+Driver+17+for+SQL+Server"
-            else:
-                return f"mssql+pyodbc://{connection.host}:{connection.port}/{connection.database}?driver=ODBC+Driver+17+for+SQL+Server&trusted_connection=yes"
-        
-        elif connection.db_type == 'sqlite':
-            return f"sqlite:///{connection.database}"
-        
-        else:
-            raise ValueError(f"Unsupported database type: {connection.db_type}")
+        if connection._cached_conn_str is None:
+            template = _CONN_TEMPLATES.get(connection.db_type)
+            if template is None:
+                raise ValueError(f"Unsupported database type: {connection.db_type}")
+            connection._cached_conn_str = template(connection)
+        return connection._cached_conn_str
     
-    def add_connection(self, connection: DatabaseConnection) -> Tuple[bool, str]:
-        """Add a new external database connection"""
+    def _connection_key(self, connection: DatabaseConnection) -> Optional[str]:
+        """Hash of the connection string, safe to keep in memory without the password"""
+        try:
+            conn_str = self.build_connection_string(connection)
+        except ValueError:
+            return None
+        return hashlib.blake2b(conn_str.encode(), digest_size=16).hexdigest()
+    
+    def add_connection(self, connection: DatabaseConnection, force: bool = False) -> Tuple[bool, str]:
+        """Add a new external database connection
+        
+        A connection string that passed a test within KNOWN_GOOD_TTL seconds is
+        not tested again unless force is set.
+        """
         try:
             # Validate connection name is unique
             if connection.name in self.connections:
                 return False, f"Connection '{connection.name}' already exists"
             
-            # Test the connection
-            success, message = self.test_connection(connection)
-            connection.test_status = "success" if success else "failed"
-            connection.last_tested = datetime.now().isoformat()
+            known_good = None if force else _KNOWN_GOOD.get(self._connection_key(connection))
+            if known_good and time.monotonic() - known_good[0] < KNOWN_GOOD_TTL:
+                success, message = True, "Connection successful"
+                connection.test_status = "success"
+                connection.last_tested = known_good[1]
+            else:
+                # Test the connection
+                success, message = self.test_connection(connection)
+                connection.test_status = "success" if success else "failed"
+                connection.last_tested = _now_iso()
             
             # Add to connections
             self.connections[connection.name] = connection
+            self._track_connection(connection, 1)
             
             # Save to file
-            self.save_connections()
+            self._append_record(connection)
             
             status_msg = "and tested successfully" if success else f"but connection test failed: {message}"
             return True, f"Connection '{connection.name}' added {status_msg}"
@@ -192,22 +293,42 @@ class ExternalDatabaseManager:
             logger.error(f"Error adding connection: {str(e)}")
             return False, f"Error adding connection: {str(e)}"
     
+    def _get_or_create_engine(self, connection: DatabaseConnection):
+        """Get the process-wide engine for a connection, creating it on first use"""
+        conn_str = self.build_connection_string(connection)
+        
+        with _ENGINE_CACHE_LOCK:
+            engine = _ENGINE_CACHE.get(conn_str)
+            if engine is None:
+                # Server databases keep a sized pool of warm connections, checked
+                # before reuse; SQLite files keep SQLAlchemy's default pool
+                pool_args = {}
+                if connection.db_type != 'sqlite':
+                    pool_args = {
+                        'pool_size': connection.pool_size,
+                        'max_overflow': connection.max_overflow,
+                        'pool_pre_ping': True
+                    }
+                
+                # Create engine with timeout
+                engine = create_engine(
+                    conn_str, 
+                    connect_args={'connect_timeout': 10} if connection.db_type == 'postgresql' else {},
+                    pool_timeout=10,
+                    pool_recycle=3600,
+                    **pool_args
+                )
+                _ENGINE_CACHE[conn_str] = engine
+        
+        return engine
+    
     def test_connection(self, connection: DatabaseConnection) -> Tuple[bool, str]:
         """Test a database connection"""
         if not SQLALCHEMY_AVAILABLE:
             return False, "SQLAlchemy not installed. Install with: pip install sqlalchemy"
         
         try:
-            # Build connection string
-            conn_str = self.build_connection_string(connection)
-            
-            # Create engine with timeout
-            engine = create_engine(
-                conn_str, 
-                connect_args={'connect_timeout': 10} if connection.db_type == 'postgresql' else {},
-                pool_timeout=10,
-                pool_recycle=3600
-            )
+            engine = self._get_or_create_engine(connection)
             
             # Test connection
             with engine.connect() as conn:
@@ -222,33 +343,66 @@ class ExternalDatabaseManager:
             
             # Cache the engine if connection successful
             self.engines[connection.name] = engine
+            _KNOWN_GOOD[self._connection_key(connection)] = (time.monotonic(), _now_iso())
             
             return True, "Connection successful"
             
         except Exception as e:
             logger.error(f"Connection test failed for {connection.name}: {str(e)}")
+            _KNOWN_GOOD.pop(self._connection_key(connection), None)
             return False, str(e)
     
+    def test_all_connections(self) -> Dict[str, Tuple[bool, str]]:
+        """Test every saved connection concurrently and record the results"""
+        connections = list(self.connections.values())
+        if not connections:
+            return {}
+        
+        # Each test waits on the network, so threads overlap the round trips
+        with ThreadPoolExecutor(max_workers=min(16, len(connections))) as executor:
+            outcomes = list(executor.map(self.test_connection, connections))
+        
+        tested_at = _now_iso()
+        results = {}
+        for connection, (success, message) in zip(connections, outcomes):
+            connection.test_status = "success" if success else "failed"
+            connection.last_tested = tested_at
+            results[connection.name] = (success, message)
+        
+        self.save_connections()
+        return results
+    
     def get_connection_engine(self, connection_name: str):
         """Get SQLAlchemy engine for a connection"""
         if connection_name in self.engines:
             return self.engines[connection_name]
         
         if connection_name in self.connections:
-            connection = self.connections[connection_name]
-            success, message = self.test_connection(connection)
-            if success:
-                return self.engines[connection_name]
-            else:
-                raise Exception(f"Cannot connect to {connection_name}: {message}")
+            if not SQLALCHEMY_AVAILABLE:
+                raise Exception(f"Cannot connect to {connection_name}: SQLAlchemy not installed. Install with: pip install sqlalchemy")
+            
+            # Engines connect lazily, so connection errors surface on first use
+            engine = self._get_or_create_engine(self.connections[connection_name])
+            self.engines[connection_name] = engine
+            return engine
         
         raise Exception(f"Connection '{connection_name}' not found")
     
+    def _get_inspector(self, connection_name: str):
+        """Get the inspector for a connection, reusing it across schema reads"""
+        inspector = self._inspectors.get(connection_name)
+        if inspector is None:
+            inspector = inspect(self.get_connection_engine(connection_name))
+            self._inspectors[connection_name] = inspector
+        else:
+            # Inspectors memoize what they reflect; start clean so schema changes show up
+            inspector.clear_cache()
+        return inspector
+    
     def get_database_schema(self, connection_name: str) -> Dict[str, Any]:
         """Get database schema information"""
         try:
-            engine = self.get_connection_engine(connection_name)
-            inspector = inspect(engine)
+            inspector = self._get_inspector(connection_name)
             
             schema_info = {
                 'tables': [],
@@ -259,6 +413,13 @@ class ExternalDatabaseManager:
             # Get all tables
             table_names = inspector.get_table_names()
             
+            # SQLAlchemy 2.0+ reflects every table's columns in one pass
+            columns_by_table = {}
+            if hasattr(inspector, 'get_multi_columns'):
+                columns_by_table = {
+                    name: columns for (_, name), columns in inspector.get_multi_columns().items()
+                }
+            
             for table_name in table_names:
                 table_info = {
                     'name': table_name,
@@ -267,7 +428,9 @@ class ExternalDatabaseManager:
                 }
                 
                 # Get column information
-                columns = inspector.get_columns(table_name)
+                columns = columns_by_table.get(table_name)
+                if columns is None:
+                    columns = inspector.get_columns(table_name)
                 for column in columns:
                     table_info['columns'].append({
                         'name': column['name'],
@@ -279,43 +442,125 @@ class ExternalDatabaseManager:
                 
                 schema_info['tables'].append(table_info)
             
+            # Fill in row counts for every table with one query
+            try:
+                row_counts = self.get_all_table_counts(connection_name, table_names)
+                for table_info in schema_info['tables']:
+                    table_info['row_count'] = row_counts.get(table_info['name'])
+            except Exception as e:
+                logger.warning(f"Could not get row counts for {connection_name}: {str(e)}")
+            
             return schema_info
             
         except Exception as e:
             logger.error(f"Error getting schema for {connection_name}: {str(e)}")
             raise
     
+    def refresh_schemas(self, connection_names: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Get schemas for several connections concurrently
+        
+        Connections whose schema could not be read map to an error dict.
+        """
+        if connection_names is None:
+            connection_names = list(self.connections)
+        if not connection_names:
+            return {}
+        
+        def load_schema(connection_name: str) -> Dict[str, Any]:
+            try:
+                return self.get_database_schema(connection_name)
+            except Exception as e:
+                return {'success': False, 'error': str(e)}
+        
+        with ThreadPoolExecutor(max_workers=min(16, len(connection_names))) as executor:
+            return dict(zip(connection_names, executor.map(load_schema, connection_names)))
+    
+    def get_all_table_counts(self, connection_name: str,
+                             table_names: Optional[List[str]] = None) -> Dict[str, Optional[int]]:
+        """Get row counts for all tables in one round trip
+        
+        Server databases report the planner's row estimates from their
+        catalog instead of scanning every table, so counts are approximate
+        there. SQLite counts exactly, in a single UNION ALL query.
+        """
+        engine = self.get_connection_engine(connection_name)
+        db_type = self.connections[connection_name].db_type
+        params = {}
+        
+        if db_type == 'postgresql':
+            query = """
+                SELECT c.relname, c.reltuples::bigint
+                FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+                WHERE c.relkind IN ('r', 'p') AND n.nspname = current_schema()
+            """
+        elif db_type == 'mysql':
+            query = """
+                SELECT table_name, table_rows FROM information_schema.tables
+                WHERE table_schema = DATABASE() AND table_type = 'BASE TABLE'
+            """
+        elif db_type == 'sqlserver':
+            query = """
+                SELECT t.name, SUM(p.row_count) FROM sys.dm_db_partition_stats p
+                JOIN sys.tables t ON t.object_id = p.object_id
+                WHERE p.index_id IN (0, 1)
+                GROUP BY t.name
+            """
+        else:
+            if table_names is None:
+                table_names = inspect(engine).get_table_names()
+            if not table_names:
+                return {}
+            
+            quote = engine.dialect.identifier_preparer.quote
+            selects = []
+            for i, table_name in enumerate(table_names):
+                params[f"t{i}"] = table_name
+                selects.append(f"SELECT :t{i}, COUNT(*) FROM {quote(table_name)}")
+            query = " UNION ALL ".join(selects)
+        
+        with engine.connect() as conn:
+            rows = conn.execute(text(query), params).fetchall()
+        
+        # Never-analyzed PostgreSQL tables report -1
+        return {name: (int(count) if count is not None and count >= 0 else None) for name, count in rows}
+    
+    def _select_result(self, result) -> Dict[str, Any]:
+        """Build the standard SELECT response from a SQLAlchemy result"""
+        columns = list(result.keys())
+        
+        # Convert to list of dictionaries. RowMapping is copied into plain dicts
+        # because results are JSON-serialized and rendered by the UI
+        data = [dict(row) for row in result.mappings()]
+        
+        return {
+            'success': True,
+            'data': data,
+            'columns': columns,
+            'row_count': len(data),
+            'query_type': 'SELECT'
+        }
+    
     def execute_query(self, connection_name: str, query: str, params: Optional[List] = None) -> Dict[str, Any]:
         """Execute a query on an external database"""
         try:
             engine = self.get_connection_engine(connection_name)
             
+            # Check if it's a SELECT query
+            is_select = SELECT_PATTERN.match(query) is not None
+            
             with engine.connect() as conn:
+                # Stream SELECT results through a server-side cursor where supported
+                if is_select:
+                    conn = conn.execution_options(stream_results=True, yield_per=1000)
+                
                 # Execute query
                 if params:
                     result = conn.execute(text(query), params)
                 else:
                     result = conn.execute(text(query))
                 
-                # Check if it's a SELECT query
-                query_upper = query.strip().upper()
-                if query_upper.startswith('SELECT'):
-                    # Fetch results
-                    rows = result.fetchall()
-                    columns = list(result.keys())
-                    
-                    # Convert to list of dictionaries
-                    data = []
-                    for row in rows:
-                        data.append(dict(zip(columns, row)))
-                    
-                    return {
-                        'success': True,
-                        'data': data,
-                        'columns': columns,
-                        'row_count': len(data),
-                        'query_type': 'SELECT'
-                    }
+                if is_select:
+                    return self._select_result(result)
                 else:
                     # For non-SELECT queries
                     conn.commit()
@@ -338,22 +583,23 @@ class ExternalDatabaseManager:
         """Get data from a table with pagination"""
         try:
             connection = self.connections[connection_name]
+            engine = self.get_connection_engine(connection_name)
             
-            # Build appropriate LIMIT/OFFSET syntax for different databases
+            # SELECT * rather than a reflected Table, so columns added elsewhere
+            # show up. The dialect quotes the name and renders its own paging
+            # syntax for the bound LIMIT/OFFSET (OFFSET...FETCH on SQL Server)
+            stmt = (select(literal_column('*')).select_from(sqlalchemy.table(table_name))
+                    .limit(bindparam('lim')).offset(bindparam('off')))
             if connection.db_type == 'sqlserver':
-                # SQL Server uses OFFSET...FETCH
-                query = f"SELECT * FROM {table_name} ORDER BY (SELECT NULL) OFFSET {offset} ROWS FETCH NEXT {limit} ROWS ONLY"
-            elif connection.db_type == 'postgresql':
-                # PostgreSQL uses LIMIT/OFFSET
-                query = f"SELECT * FROM {table_name} LIMIT {limit} OFFSET {offset}"
-            elif connection.db_type == 'mysql':
-                # MySQL uses LIMIT with OFFSET
-                query = f"SELECT * FROM {table_name} LIMIT {limit} OFFSET {offset}"
-            else:
-                # Default LIMIT/OFFSET
-                query = f"SELECT * FROM {table_name} LIMIT {limit} OFFSET {offset}"
+                # SQL Server needs an ORDER BY to page
+                stmt = stmt.order_by(text('(SELECT NULL)'))
             
-            return self.execute_query(connection_name, query)
+            with engine.connect() as conn:
+                # A cached compiled statement would also keep the result columns
+                # of its first run, hiding columns added since
+                conn = conn.execution_options(stream_results=True, yield_per=1000, compiled_cache=None)
+                result = conn.execute(stmt, {'lim': limit, 'off': offset})
+                return self._select_result(result)
             
         except Exception as e:
             logger.error(f"Error getting table data: {str(e)}")
@@ -383,18 +629,25 @@ class ExternalDatabaseManager:
                 return False, f"Connection '{connection_name}' not found"
             
             # Remove from connections
-            del self.connections[connection_name]
+            connection = self.connections.pop(connection_name)
+            self._track_connection(connection, -1)
+            self.engines.pop(connection_name, None)
+            self._inspectors.pop(connection_name, None)
             
-            # Remove cached engine
-            if connection_name in self.engines:
-                try:
-                    self.engines[connection_name].dispose()
-                    del self.engines[connection_name]
-                except:
-                    pass
+            # Dispose the shared engine unless another connection still uses it
+            try:
+                conn_str = self.build_connection_string(connection)
+                if not any(self.build_connection_string(other) == conn_str
+                           for other in self.connections.values()):
+                    with _ENGINE_CACHE_LOCK:
+                        engine = _ENGINE_CACHE.pop(conn_str, None)
+                    if engine is not None:
+                        engine.dispose()
+            except:
+                pass
             
             # Save updated connections
-            self.save_connections()
+            self._append_record({TOMBSTONE_KEY: connection_name})
             
             return True, f"Connection '{connection_name}' removed successfully"
             
@@ -410,16 +663,49 @@ class ExternalDatabaseManager:
         """Get a specific connection by name"""
         return self.connections.get(name)
     
-    def save_connections(self):
-        """Save connections to file"""
+    def _encode_record(self, record: Any) -> bytes:
+        """Encode one connection (or tombstone) as a line of the connections file"""
+        if ORJSON_AVAILABLE:
+            # orjson serializes the dataclasses directly
+            return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+        if isinstance(record, DatabaseConnection):
+            record = record.to_dict()
+        return (json.dumps(record) + "\n").encode()
+    
+    def _decode_record(self, line: bytes) -> Any:
+        """Decode one line of the connections file"""
+        if line.startswith(b'{"' + TOMBSTONE_KEY.encode()):
+            return orjson.loads(line) if ORJSON_AVAILABLE else json.loads(line)
+        if MSGSPEC_AVAILABLE:
+            return _CONNECTION_DECODER.decode(line)
+        data = orjson.loads(line) if ORJSON_AVAILABLE else json.loads(line)
+        return DatabaseConnection.from_dict(data)
+    
+    def _append_record(self, record: Any):
+        """Append one record to the connections file, compacting it when mostly stale
+        
+        The file is a log with one JSON record per line, so adding or removing
+        a connection writes one line instead of rewriting every connection.
+        """
         try:
-            connections_data = {
-                name: conn.to_dict() 
-                for name, conn in self.connections.items()
-            }
+            with open(self.config_path, 'ab') as f:
+                f.write(self._encode_record(record))
+            self._log_records += 1
             
-            with open(self.config_path, 'w') as f:
-                json.dump(connections_data, f, indent=2)
+            if self._log_records > 2 * max(len(self.connections), 1):
+                self.save_connections()
+                
+        except Exception as e:
+            logger.error(f"Error saving connections: {str(e)}")
+    
+    def save_connections(self):
+        """Save connections to file, replacing any logged history"""
+        try:
+            tmp_path = self.config_path.with_suffix(self.config_path.suffix + '.tmp')
+            with open(tmp_path, 'wb') as f:
+                f.write(b''.join(self._encode_record(conn) for conn in self.connections.values()))
+            os.replace(tmp_path, self.config_path)
+            self._log_records = len(self.connections)
                 
         except Exception as e:
             logger.error(f"Error saving connections: {str(e)}")
@@ -428,39 +714,67 @@ class ExternalDatabaseManager:
         """Load connections from file"""
         try:
             if self.config_path.exists():
-                with open(self.config_path, 'r') as f:
-                    connections_data = json.load(f)
+                # One read of the raw bytes; both parsers accept bytes directly
+                raw = self.config_path.read_bytes()
                 
-                for name, conn_data in connections_data.items():
-                    self.connections[name] = DatabaseConnection.from_dict(conn_data)
+                loaded = {}
+                first_line = raw.lstrip().split(b'\n', 1)[0].strip()
+                legacy = first_line in (b'{', b'{}')
+                if legacy:
+                    # Older files hold one indented JSON object keyed by name
+                    connections_data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+                    for name, conn_data in connections_data.items():
+                        loaded[name] = DatabaseConnection.from_dict(conn_data)
+                else:
+                    # Replay the log; later records for a name win
+                    lines = [line for line in raw.splitlines() if line.strip()]
+                    for line in lines:
+                        record = self._decode_record(line)
+                        if isinstance(record, DatabaseConnection):
+                            loaded[record.name] = record
+                        else:
+                            loaded.pop(record[TOMBSTONE_KEY], None)
+                    self._log_records = len(lines)
+                
+                self.connections.update(loaded)
+                
+                # Recount everything held rather than adding to the old totals, so
+                # reloading a live manager never counts a connection twice
+                self._by_type = Counter(map(attrgetter('db_type'), self.connections.values()))
+                self._active_count = sum(map(attrgetter('is_active'), self.connections.values()))
+                
+                # Convert older files, and compact logs that are mostly stale records
+                if legacy or self._log_records > 2 * max(len(loaded), 1):
+                    self.save_connections()
                     
         except Exception as e:
             logger.error(f"Error loading connections: {str(e)}")
     
+    def _track_connection(self, connection: DatabaseConnection, delta: int):
+        """Update the summary counters for an added (+1) or removed (-1) connection"""
+        if connection.is_active:
+            self._active_count += delta
+        self._by_type[connection.db_type] += delta
+        if self._by_type[connection.db_type] <= 0:
+            del self._by_type[connection.db_type]
+    
     def get_connection_summary(self) -> Dict[str, Any]:
         """Get summary of all connections"""
         summary = {
             'total_connections': len(self.connections),
-            'active_connections': len([c for c in self.connections.values() if c.is_active]),
-            'by_type': {},
+            'active_connections': self._active_count,
+            'by_type': dict(self._by_type),
             'recent_activity': []
         }
         
-        # Count by database type
-        for conn in self.connections.values():
-            db_type = conn.db_type
-            if db_type not in summary['by_type']:
-                summary['by_type'][db_type] = 0
-            summary['by_type'][db_type] += 1
-        
         # Recent activity
-        sorted_connections = sorted(
+        recent_connections = heapq.nlargest(
+            5,  # Last 5 activities
             self.connections.values(), 
-            key=lambda x: x.last_tested or x.created_at, 
-            reverse=True
+            key=lambda x: x.last_tested or x.created_at
         )
         
-        for conn in sorted_connections[:5]:  # Last 5 activities
+        for conn in recent_connections:
             summary['recent_activity'].append({
                 'name': conn.name,
                 'db_type': conn.db_type,
@@ -9,10 +9,46 @@ import streamlit as st
 from pathlib import Path
 import re
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, FrozenSet, List, Tuple, Optional, Any
 import io
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import chain, islice
 from csv_reader_utils import robust_read_csv, get_csv_info
 
+# Bound-parameter limit of older SQLite builds (newer ones allow 32766)
+SQLITE_MAX_VARIABLES = 999
+
+# pandas.api.types.infer_dtype results for object columns that may hold datetimes
+DATETIME_OBJECT_TYPES = frozenset({'datetime', 'datetime64', 'date', 'mixed', 'mixed-integer'})
+
+# Common date formats recognized in text columns
+DATE_FORMATS = ('%Y-%m-%d', '%m/%d/%Y', '%d/%m/%Y', '%Y-%m-%d %H:%M:%S', '%m/%d/%Y %H:%M:%S')
+
+# Name sanitizing patterns
+_EXTENSION_PATTERN = re.compile(r'\.[^.]+$')
+_NON_WORD_PATTERN = re.compile(r'[^a-zA-Z0-9_]')
+_NON_DB_NAME_PATTERN = re.compile(r'[^a-zA-Z0-9_-]')
+_UNDERSCORES_PATTERN = re.compile(r'_+')
+
+# SQL keywords that get a col_ prefix when used as column names
+_SQL_RESERVED: FrozenSet[str] = frozenset({
+    'select', 'from', 'where', 'insert', 'update', 'delete', 'create', 'drop', 
+    'alter', 'table', 'index', 'view', 'grant', 'revoke', 'commit', 'rollback',
+    'order', 'by', 'group', 'having', 'join', 'inner', 'left', 'right', 'outer',
+    'union', 'intersect', 'except', 'case', 'when', 'then', 'else', 'end',
+    'and', 'or', 'not', 'in', 'exists', 'between', 'like', 'is', 'null'
+})
+
+
+def _flatten_batches(rows, rows_per_batch: int):
+    """Yield the parameters for one multi-row INSERT per group of rows"""
+    rows = iter(rows)
+    while True:
+        batch = list(chain.from_iterable(islice(rows, rows_per_batch)))
+        if not batch:
+            return
+        yield batch
 
 class FileUploadManager:
     """Handles file uploads and database creation from CSV/Excel files"""
@@ -25,6 +61,10 @@ class FileUploadManager:
         """
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(exist_ok=True)
+        
+        # Lowercased table names in the target database, with the file state they were read at
+        self._table_cache: Optional[set] = None
+        self._table_cache_stamp: Optional[tuple] = None
     
     def set_target_database(self, db_path: str):
         """Set the target database for uploads
@@ -34,6 +74,7 @@ class FileUploadManager:
         """
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(exist_ok=True)
+        self._table_cache = None
     
     def create_new_database(self, db_name: str) -> str:
         """Create a new database file
@@ -45,8 +86,8 @@ class FileUploadManager:
             Path to the created database file
         """
         # Sanitize database name
-        db_name = re.sub(r'[^a-zA-Z0-9_-]', '_', db_name)
-        db_name = re.sub(r'_+', '_', db_name).strip('_')
+        db_name = _NON_DB_NAME_PATTERN.sub('_', db_name)
+        db_name = _UNDERSCORES_PATTERN.sub('_', db_name).strip('_')
         
         if not db_name:
             db_name = f"database_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
@@ -85,39 +126,43 @@ class FileUploadManager:
         # Set it as the target
         self.set_target_database(db_path)
         
-        # Process all uploaded files
+        # Process all uploaded files over one connection, configured once
         all_results = []
+        conn = self.get_bulk_load_connection()
         
-        for uploaded_file in uploaded_files:
-            try:
-                # Determine file type and process accordingly
-                if uploaded_file.name.lower().endswith('.csv'):
-                    results = self.process_csv_file(uploaded_file)
-                    all_results.extend(results if isinstance(results, list) else [results])
+        try:
+            for uploaded_file in uploaded_files:
+                try:
+                    # Determine file type and process accordingly
+                    if uploaded_file.name.lower().endswith('.csv'):
+                        results = self.process_csv_file(uploaded_file, conn=conn)
+                        all_results.extend(results if isinstance(results, list) else [results])
                     
-                elif uploaded_file.name.lower().endswith(('.xlsx', '.xls')):
-                    results = self.process_excel_file(uploaded_file)
-                    all_results.extend(results if isinstance(results, list) else [results])
+                    elif uploaded_file.name.lower().endswith(('.xlsx', '.xls')):
+                        results = self.process_excel_file(uploaded_file, conn=conn)
+                        all_results.extend(results if isinstance(results, list) else [results])
                     
-                else:
+                    else:
+                        all_results.append({
+                            'success': False,
+                            'message': f'Unsupported file type: {uploaded_file.name}',
+                            'file_name': uploaded_file.name,
+                            'table_name': None,
+                            'rows': 0,
+                            'columns': 0
+                        })
+                    
+                except Exception as e:
                     all_results.append({
                         'success': False,
-                        'message': f'Unsupported file type: {uploaded_file.name}',
+                        'message': f'Error processing {uploaded_file.name}: {str(e)}',
                         'file_name': uploaded_file.name,
                         'table_name': None,
                         'rows': 0,
                         'columns': 0
                     })
-                    
-            except Exception as e:
-                all_results.append({
-                    'success': False,
-                    'message': f'Error processing {uploaded_file.name}: {str(e)}',
-                    'file_name': uploaded_file.name,
-                    'table_name': None,
-                    'rows': 0,
-                    'columns': 0
-                })
+        finally:
+            conn.close()
         
         return db_path, all_results
     
@@ -142,8 +187,29 @@ class FileUploadManager:
         return databases
     
     def get_db_connection(self) -> sqlite3.Connection:
-        """Get database connection"""
-        return sqlite3.connect(self.db_path)
+        """Get database connection
+        
+        The connection is in autocommit mode; writers open their own
+        transaction with an explicit BEGIN.
+        """
+        return sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+    
+    def get_bulk_load_connection(self) -> sqlite3.Connection:
+        """Get a database connection tuned for loading uploaded data
+        
+        In WAL mode commits append to the log without an fsync, so
+        synchronous=NORMAL already skips the per-transaction sync.
+        """
+        conn = self.get_db_connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-65536")
+        return conn
+    
+    def _quote_ident(self, name: str) -> str:
+        """Quote an SQL identifier so it can never be parsed as SQL"""
+        return '"' + str(name).replace('"', '""') + '"'
     
     def sanitize_table_name(self, name: str) -> str:
         """Sanitize table name to be SQL-safe
@@ -155,13 +221,13 @@ class FileUploadManager:
             SQL-safe table name
         """
         # Remove file extension
-        name = re.sub(r'\.[^.]+$', '', name)
+        name = _EXTENSION_PATTERN.sub('', name)
         
         # Replace spaces and special characters with underscores
-        name = re.sub(r'[^a-zA-Z0-9_]', '_', name)
+        name = _NON_WORD_PATTERN.sub('_', name)
         
         # Remove consecutive underscores
-        name = re.sub(r'_+', '_', name)
+        name = _UNDERSCORES_PATTERN.sub('_', name)
         
         # Remove leading/trailing underscores
         name = name.strip('_')
@@ -176,31 +242,69 @@ class FileUploadManager:
         
         return name.lower()
     
-    def get_unique_table_name(self, base_name: str) -> str:
+    def _db_stamp(self) -> tuple:
+        """Modification time and size of the database file and its WAL"""
+        stamp = []
+        for path in (self.db_path, Path(f"{self.db_path}-wal")):
+            try:
+                stat = path.stat()
+                stamp.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+    
+    def _load_table_cache(self, conn: Optional[sqlite3.Connection] = None) -> set:
+        """Get the lowercased names of existing tables
+        
+        sqlite_master is only read again when the database file has changed
+        since the last read by something other than this manager.
+        
+        Args:
+            conn: Optional open connection to reuse instead of opening one
+        """
+        if self._table_cache is None or self._db_stamp() != self._table_cache_stamp:
+            owns_conn = conn is None
+            if owns_conn:
+                conn = self.get_db_connection()
+            cursor = conn.cursor()
+            
+            # Get existing table names
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+            self._table_cache = {row[0].lower() for row in cursor.fetchall()}
+            if owns_conn:
+                conn.close()
+            
+            self._table_cache_stamp = self._db_stamp()
+        
+        return self._table_cache
+    
+    def get_unique_table_name(self, base_name: str, conn: Optional[sqlite3.Connection] = None,
+                              reserved: Optional[set] = None) -> str:
         """Get a unique table name by appending numbers if needed
         
         Args:
             base_name: Base table name
+            conn: Optional open connection to reuse instead of opening one
+            reserved: Optional lowercased names already claimed but not yet created
             
         Returns:
             Unique table name
         """
-        conn = self.get_db_connection()
-        cursor = conn.cursor()
-        
-        # Get existing table names
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        existing_tables = {row[0].lower() for row in cursor.fetchall()}
-        conn.close()
+        existing_tables = self._load_table_cache(conn)
+        if reserved:
+            existing_tables = existing_tables | reserved
         
         # If base name is unique, use it
         if base_name not in existing_tables:
             return base_name
         
-        # Otherwise, append numbers until we find a unique name
-        counter = 1
-        while f"{base_name}_{counter}" in existing_tables:
-            counter += 1
+        # Otherwise, append one more than the highest numbered copy
+        suffix_pattern = re.compile(rf'{re.escape(base_name)}_(\d+)')
+        suffixes = [
+            int(match.group(1))
+            for match in map(suffix_pattern.fullmatch, existing_tables) if match
+        ]
+        counter = max(suffixes, default=0) + 1
         
         return f"{base_name}_{counter}"
     
@@ -239,32 +343,27 @@ class FileUploadManager:
         if pd.api.types.is_datetime64_any_dtype(non_null_series):
             return "DATE"
         
-        # Try to parse as datetime
-        if non_null_series.dtype == 'object':
-            sample = non_null_series.iloc[0] if len(non_null_series) > 0 else ""
-            if isinstance(sample, str):
-                # Try common date formats
-                date_formats = [
-                    '%Y-%m-%d', '%m/%d/%Y', '%d/%m/%Y', 
-                    '%Y-%m-%d %H:%M:%S', '%m/%d/%Y %H:%M:%S'
-                ]
-                for fmt in date_formats:
-                    try:
-                        pd.to_datetime(non_null_series.iloc[:min(5, len(non_null_series))], format=fmt)
+        # Try to parse text as datetime; one C-level inference over a small
+        # sample rules out non-text columns before any format is tried
+        if pd.api.types.is_string_dtype(non_null_series.dtype):
+            sample = non_null_series.iloc[:5]
+            if pd.api.types.infer_dtype(sample, skipna=True) == 'string':
+                for fmt in DATE_FORMATS:
+                    if pd.to_datetime(sample, format=fmt, errors='coerce').notna().all():
                         return "DATE"
-                    except:
-                        continue
         
         # Default to TEXT
         return "TEXT"
     
-    def create_table_from_dataframe(self, df: pd.DataFrame, table_name: str, replace: bool = False) -> Tuple[bool, str]:
+    def create_table_from_dataframe(self, df: pd.DataFrame, table_name: str, replace: bool = False,
+                                    conn: Optional[sqlite3.Connection] = None) -> Tuple[bool, str]:
         """Create a table from a DataFrame
         
         Args:
             df: DataFrame to create table from
             table_name: Name of the table to create
             replace: Whether to replace existing table
+            conn: Optional open connection to reuse; it is left open for the caller
             
         Returns:
             Tuple of (success, message)
@@ -280,8 +379,9 @@ class FileUploadManager:
             if len(df.columns) == 0:
                 return False, "DataFrame has no columns"
             
-            # Check for completely empty DataFrame
-            if df.isnull().all().all():
+            # Check for completely empty DataFrame; count() gives per-column
+            # non-null totals without building a boolean frame
+            if df.count().sum() == 0:
                 return False, "DataFrame contains only null values"
             
             # Clean column names
@@ -293,86 +393,124 @@ class FileUploadManager:
                 return False, "Some columns have invalid names after sanitization"
             
             # Handle duplicate column names
-            seen_cols = {}
+            seen_cols = Counter()
             new_cols = []
             for col in df.columns:
-                if col in seen_cols:
-                    seen_cols[col] += 1
-                    new_cols.append(f"{col}_{seen_cols[col]}")
-                else:
-                    seen_cols[col] = 0
-                    new_cols.append(col)
+                new_cols.append(f"{col}_{seen_cols[col]}" if seen_cols[col] else col)
+                seen_cols[col] += 1
             df.columns = new_cols
             
             # Check for reserved SQL keywords and prefix them
-            reserved_keywords = {
-                'select', 'from', 'where', 'insert', 'update', 'delete', 'create', 'drop', 
-                'alter', 'table', 'index', 'view', 'grant', 'revoke', 'commit', 'rollback',
-                'order', 'by', 'group', 'having', 'join', 'inner', 'left', 'right', 'outer',
-                'union', 'intersect', 'except', 'case', 'when', 'then', 'else', 'end',
-                'and', 'or', 'not', 'in', 'exists', 'between', 'like', 'is', 'null'
-            }
-            
-            df.columns = [f"col_{col}" if col.lower() in reserved_keywords else col for col in df.columns]
+            df.columns = [f"col_{col}" if col.lower() in _SQL_RESERVED else col for col in df.columns]
             
-            # Infer column types
+            # Infer column types; identifiers are quoted once for every statement
+            quoted_table = self._quote_ident(table_name)
+            quoted_cols = [self._quote_ident(col) for col in df.columns]
             column_definitions = []
-            for col in df.columns:
+            for col, quoted_col in zip(df.columns, quoted_cols):
                 col_type = self.infer_column_type(df[col])
-                column_definitions.append(f"{col} {col_type}")
+                column_definitions.append(f"{quoted_col} {col_type}")
             
-            # Create table
-            conn = self.get_db_connection()
+            # Dates are formatted a column at a time rather than per cell; only
+            # object columns mixing datetimes with other values need mapping
+            formatted = {}
+            for col in df.columns:
+                series = df[col]
+                if pd.api.types.is_datetime64_any_dtype(series):
+                    formatted[col] = series.dt.strftime('%Y-%m-%d')
+                elif series.dtype == object:
+                    inferred = pd.api.types.infer_dtype(series, skipna=True)
+                    if inferred == 'datetime':
+                        # Only datetimes: convert the whole column, unless it
+                        # mixes timezones or falls outside datetime64 bounds
+                        try:
+                            formatted[col] = pd.to_datetime(series).dt.strftime('%Y-%m-%d')
+                            continue
+                        except (ValueError, TypeError, AttributeError):
+                            pass
+                    if inferred in DATETIME_OBJECT_TYPES:
+                        formatted[col] = series.map(
+                            lambda value: value.strftime('%Y-%m-%d') if isinstance(value, (pd.Timestamp, datetime)) else value
+                        )
+            frame = df.assign(**formatted) if formatted else df
+            
+            # One object matrix for every row: numpy scalars become Python values
+            # sqlite3 can bind, and all missing values are replaced in one pass.
+            # Numeric columns are not downcast first: boxing erases the numpy
+            # width, SQLite already stores integers as varints, and float32
+            # would change stored REAL values
+            values = frame.to_numpy(dtype=object)
+            values[pd.isna(values)] = None
+            
+            # Create table, on the caller's connection when one is given
+            owns_conn = conn is None
+            if owns_conn:
+                conn = self.get_bulk_load_connection()
             cursor = conn.cursor()
             
-            # Drop table if replacing
-            if replace:
-                cursor.execute(f"DROP TABLE IF EXISTS {table_name}")
-            
-            # Create table SQL
-            create_sql = f"""
-            CREATE TABLE {table_name} (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                {', '.join(column_definitions)}
-            )
-            """
-            
-            cursor.execute(create_sql)
-            
-            # Insert data
-            placeholders = ', '.join(['?' for _ in range(len(df.columns) + 1)])  # +1 for id column
-            insert_sql = f"INSERT INTO {table_name} VALUES ({placeholders})"
-            
-            # Prepare data for insertion
-            for _, row in df.iterrows():
-                values: List[Any] = [None]  # Auto-increment id
-                for col in df.columns:
-                    value = row[col]
-                    
-                    # Handle different data types
-                    if pd.isna(value):
-                        values.append(None)
-                    elif isinstance(value, (pd.Timestamp, datetime)):
-                        values.append(value.strftime('%Y-%m-%d'))
-                    else:
-                        values.append(value)
+            try:
+                # Create and fill the table in one transaction, taking the
+                # write lock up front
+                cursor.execute("BEGIN IMMEDIATE")
                 
-                cursor.execute(insert_sql, values)
-            
-            conn.commit()
-            conn.close()
+                # Drop table if replacing
+                if replace:
+                    cursor.execute(f"DROP TABLE IF EXISTS {quoted_table}")
+                
+                # Create table SQL
+                create_sql = f"""
+                CREATE TABLE {quoted_table} (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    {', '.join(column_definitions)}
+                )
+                """
+                
+                cursor.execute(create_sql)
+                
+                # Insert data; id is left out so AUTOINCREMENT fills it
+                insert_sql = f"INSERT INTO {quoted_table} ({', '.join(quoted_cols)}) VALUES "
+                row_placeholders = f"({','.join('?' * len(df.columns))})"
+                
+                # Multi-row VALUES statements for as many rows as the parameter
+                # limit allows, then single-row inserts for the remainder
+                rows_per_insert = max(1, SQLITE_MAX_VARIABLES // len(df.columns))
+                batched_rows = len(df) - len(df) % rows_per_insert
+                rows = iter(values)
+                cursor.executemany(
+                    insert_sql + ', '.join([row_placeholders] * rows_per_insert),
+                    _flatten_batches(islice(rows, batched_rows), rows_per_insert)
+                )
+                cursor.executemany(insert_sql + row_placeholders, rows)
+                
+                cursor.execute("COMMIT")
+            except Exception:
+                if conn.in_transaction:
+                    cursor.execute("ROLLBACK")
+                raise
+            finally:
+                if owns_conn:
+                    conn.close()
+            
+            # Record the new table so the next unique-name check needs no query
+            if self._table_cache is not None:
+                self._table_cache.add(table_name.lower())
+                self._table_cache_stamp = self._db_stamp()
             
             return True, f"Table '{table_name}' created successfully with {len(df)} records"
         
         except Exception as e:
             return False, f"Error creating table: {str(e)}"
     
-    def process_csv_file(self, uploaded_file: Any, table_name_override: Optional[str] = None) -> List[Dict]:
+    def process_csv_file(self, uploaded_file: Any, table_name_override: Optional[str] = None,
+                         parsed: Optional[Future] = None,
+                         conn: Optional[sqlite3.Connection] = None) -> List[Dict]:
         """Process a CSV file and create database table(s)
         
         Args:
             uploaded_file: Streamlit uploaded file object
             table_name_override: Optional custom table name
+            parsed: Optional future for the file already being read in the background
+            conn: Optional open connection to create the table on
             
         Returns:
             List of results for each table created
@@ -380,8 +518,11 @@ class FileUploadManager:
         results = []
         
         try:
-            # Read CSV file using robust reader
-            df = robust_read_csv(uploaded_file)
+            # Read CSV file using robust reader. Loading through SQLite's csv
+            # virtual table is not used: the extension is not compiled into
+            # Python's sqlite3, many builds cannot load extensions at all, and
+            # it would store every column as untyped text without the id key
+            df = parsed.result() if parsed is not None else robust_read_csv(uploaded_file)
             
             if df is None:
                 results.append({
@@ -402,10 +543,10 @@ class FileUploadManager:
                 table_name = self.sanitize_table_name(uploaded_file.name)
             
             # Ensure unique table name
-            table_name = self.get_unique_table_name(table_name)
+            table_name = self.get_unique_table_name(table_name, conn)
             
             # Create table
-            success, message = self.create_table_from_dataframe(df, table_name)
+            success, message = self.create_table_from_dataframe(df, table_name, conn=conn)
             
             results.append({
                 'file_name': uploaded_file.name,
@@ -430,12 +571,42 @@ class FileUploadManager:
         
         return results
     
-    def process_excel_file(self, uploaded_file: Any, table_name_override: Optional[str] = None) -> List[Dict]:
+    def _read_excel_sheets(self, uploaded_file: Any) -> Tuple[List, Any]:
+        """Open a workbook and parse its sheets lazily
+        
+        Args:
+            uploaded_file: Streamlit uploaded file object
+            
+        Returns:
+            Tuple of (sheet_names, iterator of (sheet_name, DataFrame or the
+            exception raised while parsing that sheet))
+        """
+        # Open the workbook once; every sheet is parsed from the same loaded file
+        uploaded_file.seek(0)
+        excel_file = pd.ExcelFile(uploaded_file)
+        
+        def parse_sheets():
+            try:
+                for sheet_name in excel_file.sheet_names:
+                    try:
+                        yield sheet_name, excel_file.parse(sheet_name)
+                    except Exception as e:
+                        yield sheet_name, e
+            finally:
+                excel_file.close()
+        
+        return excel_file.sheet_names, parse_sheets()
+    
+    def process_excel_file(self, uploaded_file: Any, table_name_override: Optional[str] = None,
+                           parsed: Optional[Future] = None,
+                           conn: Optional[sqlite3.Connection] = None) -> List[Dict]:
         """Process an Excel file and create database table(s) from each sheet
         
         Args:
             uploaded_file: Streamlit uploaded file object
             table_name_override: Optional custom base table name
+            parsed: Optional future for the workbook already being read in the background
+            conn: Optional open connection to create every sheet's table on
             
         Returns:
             List of results for each sheet/table created
@@ -443,14 +614,16 @@ class FileUploadManager:
         results = []
         
         try:
-            # Read all sheets from Excel file
-            excel_file = pd.ExcelFile(uploaded_file)
-            sheet_names = excel_file.sheet_names
+            if parsed is not None:
+                sheet_names, sheets = parsed.result()
+            else:
+                sheet_names, sheets = self._read_excel_sheets(uploaded_file)
             
-            for sheet_name in sheet_names:
+            for sheet_name, df in sheets:
                 try:
-                    # Read sheet data
-                    df = pd.read_excel(uploaded_file, sheet_name=sheet_name)
+                    # Sheets that failed to parse are reported like any other sheet error
+                    if isinstance(df, Exception):
+                        raise df
                     
                     # Determine table name
                     if table_name_override:
@@ -469,10 +642,10 @@ class FileUploadManager:
                         table_name = f"{file_base}_{sheet_suffix}" if len(sheet_names) > 1 else file_base
                     
                     # Ensure unique table name
-                    table_name = self.get_unique_table_name(table_name)
+                    table_name = self.get_unique_table_name(table_name, conn)
                     
                     # Create table
-                    success, message = self.create_table_from_dataframe(df, table_name)
+                    success, message = self.create_table_from_dataframe(df, table_name, conn=conn)
                     
                     results.append({
                         'file_name': uploaded_file.name,
@@ -521,30 +694,48 @@ class FileUploadManager:
         all_results = []
         table_name_overrides = table_name_overrides or {}
         
-        for uploaded_file in uploaded_files:
-            file_name = uploaded_file.name
-            table_override = table_name_overrides.get(file_name)
-            
-            # Reset file pointer
-            uploaded_file.seek(0)
-            
-            # Process based on file type
-            if file_name.lower().endswith('.csv'):
-                results = self.process_csv_file(uploaded_file, table_override)
-            elif file_name.lower().endswith(('.xlsx', '.xls')):
-                results = self.process_excel_file(uploaded_file, table_override)
-            else:
-                results = [{
-                    'file_name': file_name,
-                    'sheet_name': None,
-                    'table_name': None,
-                    'success': False,
-                    'message': f"Unsupported file type: {file_name}",
-                    'rows': 0,
-                    'columns': 0
-                }]
-            
-            all_results.extend(results)
+        if not uploaded_files:
+            return all_results
+        
+        def read_file(uploaded_file: Any) -> Any:
+            file_name = uploaded_file.name.lower()
+            if not file_name.endswith(('.csv', '.xlsx', '.xls')):
+                return None
+            
+            # Parse a private copy of the upload's bytes, taken once, so the
+            # readers never seek or re-read the uploaded file object itself
+            buffer = io.BytesIO(uploaded_file.getvalue())
+            if file_name.endswith('.csv'):
+                return robust_read_csv(buffer)
+            sheet_names, sheets = self._read_excel_sheets(buffer)
+            return sheet_names, list(sheets)
+        
+        # Files are parsed concurrently in the background while tables are
+        # created one at a time, in upload order, on this thread
+        with ThreadPoolExecutor(max_workers=min(8, len(uploaded_files))) as executor:
+            reads = [executor.submit(read_file, uploaded_file) for uploaded_file in uploaded_files]
+            
+            for uploaded_file, parsed in zip(uploaded_files, reads):
+                file_name = uploaded_file.name
+                table_override = table_name_overrides.get(file_name)
+                
+                # Process based on file type
+                if file_name.lower().endswith('.csv'):
+                    results = self.process_csv_file(uploaded_file, table_override, parsed)
+                elif file_name.lower().endswith(('.xlsx', '.xls')):
+                    results = self.process_excel_file(uploaded_file, table_override, parsed)
+                else:
+                    results = [{
+                        'file_name': file_name,
+                        'sheet_name': None,
+                        'table_name': None,
+                        'success': False,
+                        'message': f"Unsupported file type: {file_name}",
+                        'rows': 0,
+                        'columns': 0
+                    }]
+                
+                all_results.extend(results)
         
         return all_results
     
@@ -1,22 +1,54 @@
 ﻿import sqlite3
 import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Sequence, Tuple, Union
+
+# Every user table with its columns, in one statement
+TABLE_COLUMNS_SQL = (
+    "SELECT m.name, p.name, p.type, p.\"notnull\", p.dflt_value, p.pk "
+    "FROM sqlite_master m JOIN pragma_table_info(m.name) p "
+    "WHERE m.type='table' AND m.name NOT LIKE 'sqlite_%'"
+)
+
+# SQLite's default cap on the terms of one compound SELECT
+MAX_COMPOUND_SELECT = 500
 
 
 class MultiDatabaseManager:
     def __init__(self, config_path: str = "database/db_config.json"):
         self.config_path = Path(config_path)
         self.config_path.parent.mkdir(exist_ok=True)
+        
+        # One open connection per database file, each used by one thread at a time
+        self._conns: Dict[str, sqlite3.Connection] = {}
+        self._conn_locks: Dict[str, threading.RLock] = {}
+        self._conns_lock = threading.Lock()
+        
+        # db_path -> kind -> (file stamp, value) for table lists, info and schema text
+        self._meta_cache: Dict[str, Dict[str, Tuple[tuple, Any]]] = {}
+        
+        # Bytes last read from or written to the config file; setup changes
+        # are collected and saved once
+        self._saved_config: Optional[bytes] = None
+        self._config_dirty = False
+        
         self.databases = self._load_config()
         self._ensure_default_database()
+        if self._config_dirty:
+            self._save_config()
     
     def _load_config(self) -> Dict[str, str]:
         if self.config_path.exists():
             try:
-                with open(self.config_path, 'r') as f:
-                    config = json.load(f)
-                    return config.get('databases', {})
+                with open(self.config_path, 'rb') as f:
+                    raw = f.read()
+                config = json.loads(raw)
+                self._saved_config = raw
+                return config.get('databases', {})
             except Exception:
                 return {}
         return {}
@@ -27,8 +59,20 @@ class MultiDatabaseManager:
                 'databases': self.databases,
                 'default_database': 'main'
             }
-            with open(self.config_path, 'w') as f:
-                json.dump(config, f, indent=2)
+            data = json.dumps(config, indent=2).encode('utf-8')
+            self._config_dirty = False
+            
+            # Nothing to write if the file already holds this configuration
+            if data == self._saved_config:
+                return
+            
+            # One write to a temporary file, swapped in so a crash never
+            # leaves a truncated config behind
+            tmp_path = self.config_path.with_suffix('.tmp')
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self.config_path)
+            self._saved_config = data
         except Exception:
             pass
     
@@ -41,27 +85,138 @@ class MultiDatabaseManager:
         self._discover_databases()
         
         db_path = Path(self.databases['main'])
-        if not db_path.exists():
+        try:
+            os.stat(db_path)
+        except FileNotFoundError:
+            # An empty file is a valid empty database; SQLite initializes it
+            # on the first real query, so no connection is opened here
             db_path.parent.mkdir(exist_ok=True)
-            conn = sqlite3.connect(db_path)
-            conn.close()
-            self._save_config()
+            os.close(os.open(db_path, os.O_CREAT | os.O_RDWR, 0o644))
+            self._config_dirty = True
     
     def _discover_databases(self):
-        database_dir = Path("database")
-        if not database_dir.exists():
+        try:
+            entries = os.scandir("database")
+        except FileNotFoundError:
             return
         
-        for db_file in database_dir.glob("*.db"):
-            db_path = str(db_file)
+        with entries:
+            for entry in entries:
+                if not entry.name.endswith(".db"):
+                    continue
+                
+                db_path = os.path.join("database", entry.name)
+                
+                if entry.name == "sql_agent.db":
+                    db_name = "main"
+                else:
+                    db_name = entry.name[:-len(".db")]
+                
+                if db_name not in self.databases:
+                    self.databases[db_name] = db_path
+    
+    def _get_conn(self, db_name: str) -> sqlite3.Connection:
+        """Get the cached connection for a database, opening it on first use"""
+        db_path = self.databases[db_name]
+        
+        conn = self._conns.get(db_path)
+        if conn is None:
+            # Open outside the lock so different databases can open in parallel
+            new_conn = sqlite3.connect(db_path, check_same_thread=False)
+            new_conn.execute("PRAGMA journal_mode=WAL")
+            new_conn.execute("PRAGMA synchronous=NORMAL")
+            new_conn.execute("PRAGMA temp_store=MEMORY")
+            new_conn.execute("PRAGMA cache_size=-64000")
             
-            if db_file.name == "sql_agent.db":
-                db_name = "main"
-            else:
-                db_name = db_file.stem
+            with self._conns_lock:
+                conn = self._conns.setdefault(db_path, new_conn)
+                self._conn_locks.setdefault(db_path, threading.RLock())
             
-            if db_name not in self.databases:
-                self.databases[db_name] = db_path
+            if conn is not new_conn:
+                new_conn.close()
+        
+        return conn
+    
+    @contextmanager
+    def _connection(self, db_name: str):
+        """Borrow the cached connection for a database
+        
+        The connection stays open, with its page cache, between calls; the
+        per-database lock keeps two threads from using it at once.
+        """
+        conn = self._get_conn(db_name)
+        with self._conn_locks[self.databases[db_name]]:
+            yield conn
+    
+    def _close_conn(self, db_path: str):
+        """Close and forget the cached connection for a database file"""
+        with self._conns_lock:
+            conn = self._conns.pop(db_path, None)
+            self._conn_locks.pop(db_path, None)
+        if conn is not None:
+            conn.close()
+    
+    def close_all(self):
+        """Close every cached database connection"""
+        for db_path in list(self._conns):
+            self._close_conn(db_path)
+    
+    def _db_stamp(self, db_path: str) -> tuple:
+        """Modification time and size of a database file and its WAL"""
+        stamp = []
+        for path in (db_path, f"{db_path}-wal"):
+            try:
+                st = os.stat(path)
+                stamp.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+    
+    def _cached_metadata(self, db_path: str, kind: str, stamp: tuple) -> Optional[Any]:
+        """Get cached metadata for a database if the file is unchanged since"""
+        cached = self._meta_cache.get(db_path, {}).get(kind)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        return None
+    
+    def _store_metadata(self, db_path: str, kind: str, stamp: tuple, value: Any):
+        """Cache metadata read from a database at the given file stamp"""
+        self._meta_cache.setdefault(db_path, {})[kind] = (stamp, value)
+    
+    def _table_columns(self, db_name: str, stamp: tuple) -> Dict[str, List[tuple]]:
+        """Get the column catalog of a database
+        
+        Maps each table to its (name, type, notnull, default, pk) rows. It is
+        read with one query and shared by the info and schema views until
+        the database file changes.
+        """
+        db_path = self.databases[db_name]
+        
+        catalog = self._cached_metadata(db_path, 'columns', stamp)
+        if catalog is None:
+            with self._connection(db_name) as conn:
+                catalog = {}
+                for table, *column in conn.execute(TABLE_COLUMNS_SQL).fetchall():
+                    catalog.setdefault(table, []).append(tuple(column))
+            self._store_metadata(db_path, 'columns', stamp, catalog)
+        
+        return catalog
+    
+    def _quote_ident(self, name: str) -> str:
+        """Quote an SQL identifier so it can never be parsed as SQL"""
+        return '"' + str(name).replace('"', '""') + '"'
+    
+    def _count_rows(self, cursor: sqlite3.Cursor, tables: List[str]) -> List[int]:
+        """Count the rows of many tables with UNION ALL queries instead of one per table"""
+        counts = [0] * len(tables)
+        for start in range(0, len(tables), MAX_COMPOUND_SELECT):
+            batch = range(start, min(start + MAX_COMPOUND_SELECT, len(tables)))
+            cursor.execute(" UNION ALL ".join(
+                f"SELECT {i}, COUNT(*) FROM {self._quote_ident(tables[i])}" for i in batch
+            ))
+            for i, count in cursor.fetchall():
+                counts[i] = count
+        return counts
     
     def get_databases(self) -> Dict[str, str]:
         return self.databases.copy()
@@ -69,44 +224,131 @@ class MultiDatabaseManager:
     def get_database_path(self, name: str) -> Optional[str]:
         return self.databases.get(name)
     
-    def execute_query_on_database(self, db_name: str, query: str) -> Dict[str, Any]:
+    def execute_query_on_database(self, db_name: str, query: str, as_dicts: bool = False,
+                                  max_rows: Optional[int] = None) -> Dict[str, Any]:
+        """Execute a single SQL statement on a database
+        
+        Args:
+            db_name: Database name
+            query: SQL statement
+            as_dicts: Return SELECT rows as sqlite3.Row objects, addressable by column name
+            max_rows: Fetch at most this many SELECT rows; "truncated" then
+                tells whether more were left unread
+            
+        Returns:
+            Result dictionary
+        """
         if db_name not in self.databases:
             return {"success": False, "error": "Database not found"}
         
         try:
-            db_path = self.databases[db_name]
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute(query)
-            
-            if query.strip().upper().startswith('SELECT'):
-                results = cursor.fetchall()
-                columns = [desc[0] for desc in cursor.description]
-                conn.close()
+            with self._connection(db_name) as conn:
+                cursor = conn.cursor()
+                if as_dicts:
+                    # Set on the cursor only; the cached connection keeps plain tuples
+                    cursor.row_factory = sqlite3.Row
                 
-                return {
-                    "success": True,
-                    "data": results,
-                    "columns": columns,
-                    "row_count": len(results),
-                    "database": db_name
-                }
-            else:
-                conn.commit()
-                rows_affected = cursor.rowcount
-                conn.close()
+                try:
+                    cursor.execute(query)
+                except Exception:
+                    # Never leave a failed write's transaction open on the shared connection
+                    if conn.in_transaction:
+                        conn.rollback()
+                    raise
                 
-                return {
-                    "success": True,
-                    "rows_affected": rows_affected,
-                    "database": db_name
-                }
+                if query.strip().upper().startswith('SELECT'):
+                    columns = [desc[0] for desc in cursor.description]
+                    
+                    if max_rows is None:
+                        results = cursor.fetchall()
+                    else:
+                        # Only the requested rows are ever materialized
+                        results = cursor.fetchmany(max_rows)
+                    
+                    result = {
+                        "success": True,
+                        "data": results,
+                        "columns": columns,
+                        "row_count": len(results),
+                        "database": db_name
+                    }
+                    if max_rows is not None:
+                        result["truncated"] = cursor.fetchone() is not None
+                    
+                    return result
+                else:
+                    conn.commit()
+                    rows_affected = cursor.rowcount
+                    
+                    # Writes may land within the file timestamp resolution
+                    self._meta_cache.pop(self.databases[db_name], None)
+                    
+                    return {
+                        "success": True,
+                        "rows_affected": rows_affected,
+                        "database": db_name
+                    }
+        
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "database": db_name
+            }
+    
+    def execute_many_on_database(self, db_name: str,
+                                 statements: List[Union[str, Tuple[str, Sequence]]]) -> Dict[str, Any]:
+        """Run several write statements in one transaction
+        
+        Args:
+            db_name: Database name
+            statements: SQL strings, or (sql, parameter rows) pairs that are
+                run with executemany
+            
+        Returns:
+            Result dictionary with per-statement rows affected; on error
+            nothing is committed
+        """
+        if db_name not in self.databases:
+            return {"success": False, "error": "Database not found"}
+        
+        results = []
+        
+        try:
+            with self._connection(db_name) as conn:
+                cursor = conn.cursor()
+                
+                try:
+                    # One commit for the whole batch instead of one per statement
+                    cursor.execute("BEGIN")
+                    for index, statement in enumerate(statements):
+                        if isinstance(statement, str):
+                            cursor.execute(statement)
+                        else:
+                            sql, rows = statement
+                            cursor.executemany(sql, rows)
+                        results.append({"statement": index, "rows_affected": cursor.rowcount})
+                    conn.commit()
+                except Exception:
+                    if conn.in_transaction:
+                        conn.rollback()
+                    raise
+                finally:
+                    self._meta_cache.pop(self.databases[db_name], None)
+            
+            return {
+                "success": True,
+                "results": results,
+                "rows_affected": sum(max(result["rows_affected"], 0) for result in results),
+                "database": db_name
+            }
         
         except Exception as e:
             return {
                 "success": False,
                 "error": str(e),
+                "failed_statement": len(results),
+                "results": results,
                 "database": db_name
             }
     
@@ -115,11 +357,17 @@ class MultiDatabaseManager:
         # Remove non-existent databases
         to_remove = []
         for db_name, db_path in self.databases.items():
-            if not Path(db_path).exists() and db_name != 'main':
+            if db_name == 'main':
+                continue
+            try:
+                os.stat(db_path)
+            except FileNotFoundError:
                 to_remove.append(db_name)
         
         for db_name in to_remove:
-            del self.databases[db_name]
+            self._close_conn(self.databases.pop(db_name))
+        
+        self._meta_cache.clear()
         
         # Ensure main database exists
         self._ensure_default_database()
@@ -169,38 +417,42 @@ class MultiDatabaseManager:
         
         try:
             db_path = self.databases[name]
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
+            stamp = self._db_stamp(db_path)
             
-            # Get tables
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'")
-            tables = [row[0] for row in cursor.fetchall()]
+            info = self._cached_metadata(db_path, 'info', stamp)
+            if info is not None:
+                return dict(info)
             
-            # Get total record count
-            total_records = 0
-            table_info = {}
+            # Get tables and their columns
+            catalog = self._table_columns(name, stamp)
+            column_details = {
+                table: [{"name": col_name, "type": col_type} for col_name, col_type, *_ in columns]
+                for table, columns in catalog.items()
+            }
+            tables = list(column_details)
             
-            for table in tables:
-                cursor.execute(f"SELECT COUNT(*) FROM {table}")
-                count = cursor.fetchone()[0]
-                total_records += count
-                
-                # Get column info
-                cursor.execute(f"PRAGMA table_info({table})")
-                columns = cursor.fetchall()
+            with self._connection(name) as conn:
+                cursor = conn.cursor()
                 
-                table_info[table] = {
-                    "rows": count,
-                    "columns": len(columns),
-                    "column_details": [{"name": col[1], "type": col[2]} for col in columns]
+                # Get total record count
+                counts = self._count_rows(cursor, tables)
+                total_records = sum(counts)
+                table_info = {
+                    table: {
+                        "rows": count,
+                        "columns": len(column_details[table]),
+                        "column_details": column_details[table]
+                    }
+                    for table, count in zip(tables, counts)
                 }
             
-            conn.close()
-            
             # Get file size
-            file_size = Path(db_path).stat().st_size if Path(db_path).exists() else 0
+            try:
+                file_size = os.stat(db_path).st_size
+            except FileNotFoundError:
+                file_size = 0
             
-            return {
+            info = {
                 "name": name,
                 "path": db_path,
                 "tables": tables,
@@ -209,6 +461,9 @@ class MultiDatabaseManager:
                 "file_size": file_size,
                 "table_info": table_info
             }
+            self._store_metadata(db_path, 'info', stamp, info)
+            
+            return dict(info)
         except Exception as e:
             return {"error": str(e)}
     
@@ -219,26 +474,43 @@ class MultiDatabaseManager:
             Dictionary of database_name -> list of tables
         """
         all_tables = {}
+        db_names = list(self.databases)
         
-        for db_name in self.databases:
-            try:
-                db_path = self.databases[db_name]
-                conn = sqlite3.connect(db_path)
+        if not db_names:
+            return all_tables
+        
+        # Each database has its own file and connection, so they are read concurrently
+        with ThreadPoolExecutor(max_workers=min(32, len(db_names))) as executor:
+            futures = [executor.submit(self._fetch_tables, db_name) for db_name in db_names]
+            
+            for db_name, future in zip(db_names, futures):
+                try:
+                    all_tables[db_name] = future.result()
+                except Exception as e:
+                    print(f"Error getting tables from {db_name}: {e}")
+                    all_tables[db_name] = []
+        
+        return all_tables
+    
+    def _fetch_tables(self, db_name: str) -> List[str]:
+        """Get the table names of one database, from cache while the file is unchanged"""
+        db_path = self.databases[db_name]
+        stamp = self._db_stamp(db_path)
+        
+        tables = self._cached_metadata(db_path, 'tables', stamp)
+        if tables is None:
+            with self._connection(db_name) as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'")
                 tables = [row[0] for row in cursor.fetchall()]
-                all_tables[db_name] = tables
-                
-                conn.close()
-            except Exception as e:
-                print(f"Error getting tables from {db_name}: {e}")
-                all_tables[db_name] = []
+            self._store_metadata(db_path, 'tables', stamp, tables)
         
-        return all_tables
+        return list(tables)
     
     def refresh_configuration(self):
         """Refresh the database configuration by scanning for new database files"""
+        self._meta_cache.clear()
         self._discover_databases()
         self._save_config()
     
@@ -257,48 +529,53 @@ class MultiDatabaseManager:
             if db_name not in self.databases:
                 continue
                 
+            db_path = self.databases[db_name]
+            stamp = self._db_stamp(db_path)
+            
+            # Sections of unchanged databases are reused as rendered
+            cached = self._cached_metadata(db_path, 'schema', stamp)
+            if cached is not None:
+                schema_info += cached
+                continue
+            
+            section = ""
             try:
-                db_path = self.databases[db_name]
-                conn = sqlite3.connect(db_path)
-                cursor = conn.cursor()
-                
-                schema_info += f"DATABASE: {db_name} ({db_path})\n"
-                schema_info += "=" * 50 + "\n"
-                
-                # Get tables
-                cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'")
-                tables = [row[0] for row in cursor.fetchall()]
-                
-                for table in tables:
-                    schema_info += f"Table: {db_name}.{table}\n"
-                    cursor.execute(f"PRAGMA table_info({table})")
-                    columns = cursor.fetchall()
-                    
-                    for col in columns:
-                        col_name, col_type, not_null, default, pk = col[1], col[2], col[3], col[4], col[5]
-                        constraints = []
-                        if pk:
-                            constraints.append("PRIMARY KEY")
-                        if not_null:
-                            constraints.append("NOT NULL")
-                        if default:
-                            constraints.append(f"DEFAULT {default}")
-                        
-                        constraint_str = f" ({', '.join(constraints)})" if constraints else ""
-                        schema_info += f"  - {col_name}: {col_type}{constraint_str}\n"
+                with self._connection(db_name) as conn:
+                    cursor = conn.cursor()
                     
-                    # Get sample data (first 2 rows to keep it compact)
-                    cursor.execute(f"SELECT * FROM {table} LIMIT 2")
-                    sample_data = cursor.fetchall()
-                    if sample_data:
-                        schema_info += f"  Sample data: {sample_data}\n"
+                    section += f"DATABASE: {db_name} ({db_path})\n"
+                    section += "=" * 50 + "\n"
                     
-                    schema_info += "\n"
+                    # Get tables and all their columns
+                    for table, columns in self._table_columns(db_name, stamp).items():
+                        section += f"Table: {db_name}.{table}\n"
+                        
+                        for col_name, col_type, not_null, default, pk in columns:
+                            constraints = []
+                            if pk:
+                                constraints.append("PRIMARY KEY")
+                            if not_null:
+                                constraints.append("NOT NULL")
+                            if default:
+                                constraints.append(f"DEFAULT {default}")
+                            
+                            constraint_str = f" ({', '.join(constraints)})" if constraints else ""
+                            section += f"  - {col_name}: {col_type}{constraint_str}\n"
+                        
+                        # Get sample data (first 2 rows to keep it compact)
+                        cursor.execute(f"SELECT * FROM {self._quote_ident(table)} LIMIT 2")
+                        sample_data = cursor.fetchall()
+                        if sample_data:
+                            section += f"  Sample data: {sample_data}\n"
+                        
+                        section += "\n"
+                
+                section += "\n"
                 
-                conn.close()
-                schema_info += "\n"
+                self._store_metadata(db_path, 'schema', stamp, section)
+                schema_info += section
                 
             except Exception as e:
-                schema_info += f"Error reading database {db_name}: {str(e)}\n\n"
+                schema_info += section + f"Error reading database {db_name}: {str(e)}\n\n"
         
         return schema_info
@@ -125,10 +125,14 @@ class SQLAgent:
         except Exception as e:
             return f"Error getting schema: {str(e)}"
     
+    def _get_connection(self) -> sqlite3.Connection:
+        """Open the connection generated SQL queries are executed on"""
+        return sqlite3.connect(self.db_path)
+    
     def _execute_sql_query(self, query: str) -> Dict[str, Any]:
         """Execute SQL query and return results"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._get_connection()
             cursor = conn.cursor()
             
             # Execute query
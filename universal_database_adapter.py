@@ -41,33 +41,36 @@ class UniversalDatabaseAdapter:
             }
         
         # Get external databases
-        external_connections = self.external_manager.list_connections()
+        external_connections = [
+            conn for conn in self.external_manager.list_connections()
+            if conn.is_active and conn.test_status == 'success'
+        ]
+        schemas = self.external_manager.refresh_schemas([conn.name for conn in external_connections])
         for conn in external_connections:
-            if conn.is_active and conn.test_status == 'success':
-                try:
-                    schema_info = self.external_manager.get_database_schema(conn.name)
-                    all_databases[f"🌐 {conn.name}"] = {
-                        'type': conn.db_type,
-                        'connection_name': conn.name,
-                        'host': f"{conn.host}:{conn.port}",
-                        'database': conn.database,
-                        'tables': schema_info.get('tables', []),
-                        'is_external': True,
-                        'connection_info': conn
-                    }
-                except Exception as e:
-                    logger.warning(f"Could not get schema for external database {conn.name}: {str(e)}")
-                    # Still include it but mark as problematic
-                    all_databases[f"🌐 {conn.name} ⚠️"] = {
-                        'type': conn.db_type,
-                        'connection_name': conn.name,
-                        'host': f"{conn.host}:{conn.port}",
-                        'database': conn.database,
-                        'tables': [],
-                        'is_external': True,
-                        'connection_info': conn,
-                        'error': str(e)
-                    }
+            schema_info = schemas[conn.name]
+            if 'error' not in schema_info:
+                all_databases[f"🌐 {conn.name}"] = {
+                    'type': conn.db_type,
+                    'connection_name': conn.name,
+                    'host': f"{conn.host}:{conn.port}",
+                    'database': conn.database,
+                    'tables': schema_info.get('tables', []),
+                    'is_external': True,
+                    'connection_info': conn
+                }
+            else:
+                logger.warning(f"Could not get schema for external database {conn.name}: {schema_info['error']}")
+                # Still include it but mark as problematic
+                all_databases[f"🌐 {conn.name} ⚠️"] = {
+                    'type': conn.db_type,
+                    'connection_name': conn.name,
+                    'host': f"{conn.host}:{conn.port}",
+                    'database': conn.database,
+                    'tables': [],
+                    'is_external': True,
+                    'connection_info': conn,
+                    'error': schema_info['error']
+                }
         
         return all_databases
     